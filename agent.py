@@ -7,12 +7,34 @@ and generates website creation prompts for Figma Make or v0.
 """
 
 import asyncio
+import hashlib
+import io
+import orjson
 import os
 import logging
+import re
+import httpx
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-from groq import Groq
+from telegram.ext import (
+    AIORateLimiter,
+    Application,
+    CommandHandler,
+    MessageHandler,
+    PicklePersistence,
+    filters,
+    ContextTypes
+)
+from groq import AsyncGroq
 from duckduckgo_search import DDGS
+from cachetools import LRUCache, TTLCache
+
+# AsyncDDGS exists in duckduckgo_search >= 4; fall back to the sync
+# client in a worker thread on older versions
+try:
+    from duckduckgo_search import AsyncDDGS
+    HAS_ASYNC_DDGS = True
+except ImportError:
+    HAS_ASYNC_DDGS = False
 
 # Configure logging
 logging.basicConfig(
@@ -21,41 +43,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Store conversation state per user
-user_sessions = {}
+# Per-user locks so concurrent updates from the same user stay
+# serialized; kept out of the persisted session state because locks
+# can't be pickled
+user_locks = {}
 
 
-class BusinessResearchAgent:
-    """Agent that researches businesses and generates website prompts."""
+def get_user_lock(user_id: int) -> asyncio.Lock:
+    return user_locks.setdefault(user_id, asyncio.Lock())
 
-    def __init__(self):
-        self.groq = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        self.model = "llama-3.3-70b-versatile"  # Free, powerful model
 
-    def web_search(self, query: str, max_results: int = 10) -> str:
-        """Perform web search using DuckDuckGo (free)."""
-        try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
+def get_session(context: ContextTypes.DEFAULT_TYPE) -> dict:
+    """Per-user session state, stored in PTB's persisted user_data."""
+    session = context.user_data
+    if "state" not in session:
+        session["state"] = "waiting_for_info"
+        session.setdefault("data", {})
+    return session
 
-            if not results:
-                return "No search results found."
 
-            formatted = []
-            for r in results:
-                formatted.append(f"**{r['title']}**\n{r['body']}\nURL: {r['href']}\n")
 
-            return "\n".join(formatted)
-        except Exception as e:
-            logger.error(f"Search error: {e}")
-            return f"Search failed: {str(e)}"
 
-    async def research_business(self, business_info: str) -> dict:
-        """
-        Perform deep research on a business and generate insights.
-        """
-        # Step 1: Extract key info and search queries
-        extraction_prompt = f"""Analyze this business info and extract:
+EXTRACTION_TEMPLATE = """Analyze this business info and extract:
 1. Business name
 2. Industry/niche
 3. Location (if mentioned)
@@ -63,37 +72,10 @@ class BusinessResearchAgent:
 
 Business info: {business_info}
 
-Respond in this format:
-BUSINESS_NAME: [name]
-INDUSTRY: [industry]
-LOCATION: [location or "not specified"]
-SEARCH_1: [first search query]
-SEARCH_2: [second search query]
-SEARCH_3: [third search query]"""
+Respond with a JSON object in exactly this shape:
+{{"business_name": "...", "industry": "...", "location": "... or null", "search_queries": ["...", "...", "..."]}}"""
 
-        extraction = self.groq.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": extraction_prompt}],
-            max_tokens=500
-        )
-
-        extracted = extraction.choices[0].message.content
-
-        # Step 2: Perform web searches
-        search_results = []
-        lines = extracted.split('\n')
-        for line in lines:
-            if line.startswith('SEARCH_'):
-                query = line.split(':', 1)[-1].strip()
-                if query:
-                    logger.info(f"Searching: {query}")
-                    results = self.web_search(query, max_results=5)
-                    search_results.append(f"### Search: {query}\n{results}")
-
-        web_research = "\n\n".join(search_results) if search_results else "No web research performed."
-
-        # Step 3: Deep analysis with all gathered info
-        research_prompt = f"""You are a business research expert. Analyze the following business information and web research to provide comprehensive insights.
+RESEARCH_TEMPLATE = """You are a business research expert. Analyze the following business information and web research to provide comprehensive insights.
 
 ## BUSINESS INFO PROVIDED:
 {business_info}
@@ -143,46 +125,31 @@ Based on all this information, provide a detailed analysis:
 
 Provide detailed, actionable insights that can be used to create an effective website."""
 
-        response = self.groq.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": research_prompt}],
-            max_tokens=4096
-        )
-
-        return {
-            "research": response.choices[0].message.content,
-            "business_info": business_info,
-            "web_research": web_research
-        }
-
-    async def generate_website_prompt(self, research_data: dict, platform: str = "v0") -> str:
-        """
-        Generate a detailed website creation prompt for Figma Make or v0.
-        """
-        if platform.lower() == "figma":
-            platform_instructions = """Generate a prompt for Figma Make that:
+FIGMA_INSTRUCTIONS = """Generate a prompt for Figma Make that:
 - Describes the exact layout and component structure
 - Specifies design tokens (colors, spacing, typography)
 - Includes component hierarchy and naming
 - Provides detailed styling instructions
 - Uses Figma-specific terminology"""
-        else:  # v0
-            platform_instructions = """Generate a prompt for v0.dev that:
+
+V0_INSTRUCTIONS = """Generate a prompt for v0.dev that:
 - Describes the React/Next.js components needed
 - Specifies Tailwind CSS styling preferences
 - Includes responsive design requirements
 - Provides clear visual hierarchy instructions
 - Uses shadcn/ui components where appropriate"""
 
-        generation_prompt = f"""Based on this business research, create a comprehensive website generation prompt.
+PLATFORM_INSTRUCTIONS = {"figma": FIGMA_INSTRUCTIONS, "v0": V0_INSTRUCTIONS}
+
+GENERATION_SYSTEM_TEMPLATE = """Based on this business research, create a comprehensive website generation prompt.
 
 ## RESEARCH DATA:
-{research_data['research']}
+{research}
 
 ## ORIGINAL BUSINESS INFO:
-{research_data['business_info']}
+{business_info}"""
 
-## PLATFORM REQUIREMENTS:
+GENERATION_TEMPLATE = """## PLATFORM REQUIREMENTS:
 {platform_instructions}
 
 Create an extremely detailed prompt that will generate a professional, conversion-optimized website. The prompt should be:
@@ -219,13 +186,365 @@ Create an extremely detailed prompt that will generate a professional, conversio
 
 Format the output as a single, copy-paste ready prompt for {platform}. Start the prompt with "Create a..." and make it comprehensive enough to generate a complete, professional website."""
 
-        response = self.groq.chat.completions.create(
+# Stale-while-revalidate windows for the pipeline caches
+RESEARCH_TTL = 3600
+PROMPT_TTL = 3600
+
+SEARCH_RE = re.compile(r'^SEARCH_\d+:\s*(.+)$', re.M)
+
+TELEGRAM_MESSAGE_LIMIT = 4000
+
+
+def split_for_telegram(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> list:
+    """Split text into Telegram-sized chunks in a single pass.
+
+    Walks the string once with a cursor, cutting at the last paragraph
+    break inside each window, falling back to a line break, then a
+    space, and hard-cutting only when a window has no break at all.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    chunks = []
+    pos = 0
+    n = len(text)
+    while n - pos > limit:
+        window = pos + limit
+        cut = text.rfind('\n\n', pos, window)
+        if cut <= pos:
+            cut = text.rfind('\n', pos, window)
+        if cut <= pos:
+            cut = text.rfind(' ', pos, window)
+        if cut <= pos:
+            cut = window
+        chunk = text[pos:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        pos = cut
+        while pos < n and text[pos] in ' \n':
+            pos += 1
+    tail = text[pos:].strip()
+    if tail:
+        chunks.append(tail)
+    return chunks
+
+
+def is_near_duplicate(tokens: set, kept_token_sets: list, threshold: float = 0.85) -> bool:
+    """Check whether a result body is a near-duplicate of one already kept."""
+    if not tokens:
+        return False
+    for other in kept_token_sets:
+        union = len(tokens | other)
+        if union and len(tokens & other) / union >= threshold:
+            return True
+    return False
+
+
+def make_stream_editor(status_msg, header: str):
+    """Build a progress callback that mirrors partial output into one message."""
+    async def edit(partial: str) -> None:
+        try:
+            await status_msg.edit_text(
+                f"{header}\n\n{partial[-TELEGRAM_MESSAGE_LIMIT:]}"
+            )
+        except Exception:
+            # Edits can fail transiently (rate limit, unchanged text);
+            # the next tick will catch up
+            pass
+    return edit
+
+
+async def send_long_message(message, header: str, text: str) -> None:
+    """Send text as one message, or as concurrently dispatched parts."""
+    chunks = split_for_telegram(text)
+    if len(chunks) == 1:
+        await message.reply_text(f"{header}\n\n{text}")
+        return
+
+    await message.reply_text(f"{header}\n\n(Split into parts due to length)")
+    # Telegram preserves arrival order per chat, so the sends can overlap
+    await asyncio.gather(
+        *(message.reply_text(f"**Part {i+1}:**\n\n{chunk}")
+          for i, chunk in enumerate(chunks))
+    )
+
+
+class BusinessResearchAgent:
+    """Agent that researches businesses and generates website prompts."""
+
+    def __init__(self):
+        # One shared pool for every Groq call so TLS sessions are reused
+        # across handlers instead of re-handshaking per request
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
+        self.groq = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=self._http)
+        # Right-sized models per task: the extraction step only has to
+        # emit a short JSON object, so the small instant model handles it
+        self.extraction_model = "llama-3.1-8b-instant"
+        self.research_model = "llama-3.3-70b-versatile"
+        self.model = self.research_model
+        # Identical queries are common across users; cache hits also
+        # avoid burning DuckDuckGo rate-limit budget
+        self._search_cache = TTLCache(maxsize=1024, ttl=3600)
+        # Full pipeline results keyed on the business info text, and
+        # website prompts keyed on (research hash, platform)
+        self._research_cache = LRUCache(maxsize=128)
+        self._prompt_cache = LRUCache(maxsize=256)
+
+    @staticmethod
+    def _sync_search(query: str, max_results: int) -> list:
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+    async def web_search(self, query: str, max_results: int = 10) -> list:
+        """Perform web search using DuckDuckGo (free), cached for an hour.
+
+        Returns the raw result dicts so callers can deduplicate before
+        formatting.
+        """
+        cache_key = (query.strip().lower(), max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Search cache hit: {query}")
+            return cached
+
+        try:
+            if HAS_ASYNC_DDGS:
+                async with AsyncDDGS() as ddgs:
+                    results = await ddgs.atext(query, max_results=max_results)
+            else:
+                results = await asyncio.to_thread(self._sync_search, query, max_results)
+
+            if results:
+                self._search_cache[cache_key] = results
+            return results or []
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            return []
+
+    async def _cached_swr(self, cache, key, ttl, refresh, bg_refresh=None):
+        """Serve from cache, refreshing stale entries in the background.
+
+        refresh is a no-arg callable returning the coroutine that
+        recomputes the value. Hits return in microseconds; stale hits
+        additionally kick off a background recompute so the entry stays
+        fresh without blocking the user. When the foreground refresh
+        reports progress to the user, pass a silent variant as
+        bg_refresh — nobody is watching the background run.
+        """
+        loop = asyncio.get_running_loop()
+        entry = cache.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            if loop.time() - stored_at >= ttl:
+                logger.info(f"Cache stale, revalidating in background: {key}")
+                asyncio.create_task(
+                    self._revalidate(cache, key, bg_refresh or refresh))
+            return value
+
+        value = await refresh()
+        cache[key] = (value, loop.time())
+        return value
+
+    async def _revalidate(self, cache, key, refresh):
+        try:
+            value = await refresh()
+            cache[key] = (value, asyncio.get_running_loop().time())
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {key}: {e}")
+
+    @staticmethod
+    def _research_key(business_info: str) -> str:
+        return hashlib.blake2b(
+            business_info.strip().lower().encode(), digest_size=16
+        ).hexdigest()
+
+    async def research_business(self, business_info: str) -> dict:
+        """
+        Perform deep research on a business and generate insights.
+
+        Cached on the business info text with stale-while-revalidate.
+        """
+        research_key = self._research_key(business_info)
+        return await self._cached_swr(
+            self._research_cache, research_key, RESEARCH_TTL,
+            lambda: self._research_business_uncached(business_info, research_key)
+        )
+
+    async def _research_business_uncached(self, business_info: str, research_key: str) -> dict:
+        # Step 1: Extract key info and search queries
+        extraction_prompt = EXTRACTION_TEMPLATE.format(business_info=business_info)
+
+        extraction = await self.groq.chat.completions.create(
+            model=self.extraction_model,
+            messages=[{"role": "user", "content": extraction_prompt}],
+            max_tokens=500,
+            response_format={"type": "json_object"}
+        )
+
+        extracted = extraction.choices[0].message.content
+
+        # Step 2: Perform web searches concurrently
+        try:
+            # orjson parses in C; the stdlib parser runs bytecode per token
+            data = orjson.loads(extracted)
+            queries = [q.strip() for q in data.get("search_queries", [])
+                       if isinstance(q, str) and q.strip()]
+        except (orjson.JSONDecodeError, AttributeError):
+            logger.warning("Extraction was not valid JSON, falling back to line parsing")
+            queries = [q.strip() for q in SEARCH_RE.findall(extracted) if q.strip()]
+
+        # Kick the searches off immediately; they are only awaited right
+        # before the analysis prompt needs their results
+        search_task = None
+        if queries:
+            logger.info(f"Running {len(queries)} searches concurrently")
+            search_task = asyncio.gather(
+                *(self.web_search(q, 5) for q in queries),
+                return_exceptions=True
+            )
+
+        # Deduplicate before formatting: the same URL and near-identical
+        # snippets show up across searches, and every duplicate costs
+        # prefill tokens on the analysis call
+        buf = io.StringIO()
+        if search_task:
+            results = await search_task
+            seen_urls = set()
+            kept_token_sets = []
+            for query, result in zip(queries, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Search failed for '{query}': {result}")
+                    continue
+                if buf.tell():
+                    buf.write("\n\n")
+                buf.write("### Search: ")
+                buf.write(query)
+                buf.write("\n")
+                wrote_result = False
+                for r in result:
+                    href = r.get('href', '')
+                    if href and href in seen_urls:
+                        continue
+                    body = r.get('body', '')[:200]
+                    tokens = set(body.lower().split())
+                    if is_near_duplicate(tokens, kept_token_sets):
+                        continue
+                    if href:
+                        seen_urls.add(href)
+                    kept_token_sets.append(tokens)
+                    buf.write("**")
+                    buf.write(r.get('title', ''))
+                    buf.write("**\n")
+                    buf.write(body)
+                    buf.write("\nURL: ")
+                    buf.write(href)
+                    buf.write("\n\n")
+                    wrote_result = True
+                if not wrote_result:
+                    buf.write("No new results.")
+
+        web_research = buf.getvalue() or "No web research performed."
+
+        # Step 3: Deep analysis with all gathered info
+        research_prompt = RESEARCH_TEMPLATE.format(
+            business_info=business_info,
+            extracted=extracted,
+            web_research=web_research
+        )
+
+        response = await self.groq.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": research_prompt}],
+            max_tokens=4096
+        )
+
+        return {
+            "research": response.choices[0].message.content,
+            "business_info": business_info,
+            "web_research": web_research,
+            "cache_key": research_key
+        }
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        await self._http.aclose()
+
+    async def generate_website_prompt(
+        self,
+        research_data: dict,
+        platform: str = "v0",
+        progress_callback=None
+    ) -> str:
+        """
+        Generate a detailed website creation prompt for Figma Make or v0.
+
+        Streams tokens from Groq and reports partial output through
+        progress_callback (an async callable taking the partial text).
+        """
+        research_key = research_data.get("cache_key") or self._research_key(research_data["research"])
+        prompt_key = (research_key, platform.lower())
+        return await self._cached_swr(
+            self._prompt_cache, prompt_key, PROMPT_TTL,
+            lambda: self._generate_website_prompt_uncached(
+                research_data, platform, progress_callback
+            ),
+            # Background revalidation must not stream into whatever
+            # status message the live callback is bound to
+            bg_refresh=lambda: self._generate_website_prompt_uncached(
+                research_data, platform
+            )
+        )
+
+    async def _generate_website_prompt_uncached(
+        self,
+        research_data: dict,
+        platform: str,
+        progress_callback=None
+    ) -> str:
+        platform_instructions = PLATFORM_INSTRUCTIONS.get(
+            platform.lower(), PLATFORM_INSTRUCTIONS["v0"]
+        )
+
+        # The shared research block goes in the system message and stays
+        # byte-identical between the v0 and figma calls, so provider-side
+        # prompt-prefix caching can reuse it; only the small
+        # platform-specific delta rides in the user message.
+        system_prompt = GENERATION_SYSTEM_TEMPLATE.format(
+            research=research_data['research'],
+            business_info=research_data['business_info']
+        )
+
+        generation_prompt = GENERATION_TEMPLATE.format(
+            platform_instructions=platform_instructions,
+            platform=platform
+        )
+
+        stream = await self.groq.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": generation_prompt}],
-            max_tokens=8000
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": generation_prompt}
+            ],
+            max_tokens=8000,
+            stream=True
         )
 
-        return response.choices[0].message.content
+        # Stream tokens and surface partial output roughly once a second,
+        # so the user sees progress instead of 15-45s of dead air
+        parts = []
+        loop = asyncio.get_running_loop()
+        last_update = loop.time()
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if progress_callback and loop.time() - last_update >= 1.0:
+                    last_update = loop.time()
+                    await progress_callback("".join(parts))
+
+        return "".join(parts)
 
 
 # Initialize the agent
@@ -241,8 +560,9 @@ def get_agent():
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a message when the command /start is issued."""
-    user_id = update.effective_user.id
-    user_sessions[user_id] = {"state": "waiting_for_info", "data": {}}
+    session = get_session(context)
+    session["state"] = "waiting_for_info"
+    session["data"] = {}
 
     welcome_message = """🚀 Welcome to the Business Website Prompt Generator!
 
@@ -290,33 +610,28 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
 async def clear_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Clear the user's session."""
-    user_id = update.effective_user.id
-    user_sessions[user_id] = {"state": "waiting_for_info", "data": {}}
+    session = get_session(context)
+    session["state"] = "waiting_for_info"
+    session["data"] = {}
     await update.message.reply_text("✅ Session cleared! Send me new business information to start fresh.")
 
 
 async def generate_v0_prompt(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Generate a v0 prompt from researched data."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
+    session = get_session(context)
 
     if "research" not in session.get("data", {}):
         await update.message.reply_text("❌ No research data found. Please send your business information first!")
         return
 
-    await update.message.reply_text("⏳ Generating v0 prompt... This may take a moment.")
+    status_msg = await update.message.reply_text("⏳ Generating v0 prompt... This may take a moment.")
 
     try:
-        prompt = await get_agent().generate_website_prompt(session["data"]["research"], "v0")
-
-        # Split long messages if needed (Telegram has 4096 char limit)
-        if len(prompt) > 4000:
-            chunks = [prompt[i:i+4000] for i in range(0, len(prompt), 4000)]
-            await update.message.reply_text("**✅ v0.dev Website Prompt:**\n\n(Split into parts due to length)")
-            for i, chunk in enumerate(chunks):
-                await update.message.reply_text(f"**Part {i+1}:**\n\n{chunk}")
-        else:
-            await update.message.reply_text(f"**✅ v0.dev Website Prompt:**\n\n{prompt}")
+        prompt = await get_agent().generate_website_prompt(
+            session["data"]["research"], "v0",
+            progress_callback=make_stream_editor(status_msg, "⏳ Generating v0 prompt...")
+        )
+        await send_long_message(update.message, "**✅ v0.dev Website Prompt:**", prompt)
     except Exception as e:
         logger.error(f"Error generating v0 prompt: {e}")
         await update.message.reply_text(f"❌ Error generating prompt: {str(e)}")
@@ -324,25 +639,20 @@ async def generate_v0_prompt(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def generate_figma_prompt(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Generate a Figma Make prompt from researched data."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
+    session = get_session(context)
 
     if "research" not in session.get("data", {}):
         await update.message.reply_text("❌ No research data found. Please send your business information first!")
         return
 
-    await update.message.reply_text("⏳ Generating Figma Make prompt... This may take a moment.")
+    status_msg = await update.message.reply_text("⏳ Generating Figma Make prompt... This may take a moment.")
 
     try:
-        prompt = await get_agent().generate_website_prompt(session["data"]["research"], "figma")
-
-        if len(prompt) > 4000:
-            chunks = [prompt[i:i+4000] for i in range(0, len(prompt), 4000)]
-            await update.message.reply_text("**✅ Figma Make Website Prompt:**\n\n(Split into parts due to length)")
-            for i, chunk in enumerate(chunks):
-                await update.message.reply_text(f"**Part {i+1}:**\n\n{chunk}")
-        else:
-            await update.message.reply_text(f"**✅ Figma Make Website Prompt:**\n\n{prompt}")
+        prompt = await get_agent().generate_website_prompt(
+            session["data"]["research"], "figma",
+            progress_callback=make_stream_editor(status_msg, "⏳ Generating Figma Make prompt...")
+        )
+        await send_long_message(update.message, "**✅ Figma Make Website Prompt:**", prompt)
     except Exception as e:
         logger.error(f"Error generating Figma prompt: {e}")
         await update.message.reply_text(f"❌ Error generating prompt: {str(e)}")
@@ -352,40 +662,41 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """Handle incoming business information."""
     user_id = update.effective_user.id
     message_text = update.message.text
-
-    # Initialize session if needed
-    if user_id not in user_sessions:
-        user_sessions[user_id] = {"state": "waiting_for_info", "data": {}}
-
-    session = user_sessions[user_id]
-
-    await update.message.reply_text(
-        "📥 Received your business information!\n\n"
-        "🔍 Starting deep research...\n"
-        "• Analyzing your business\n"
-        "• Searching competitors & trends\n"
-        "• Gathering industry insights\n\n"
-        "⏳ This typically takes 30-60 seconds. Please wait."
-    )
+    session = get_session(context)
+
+    # Backpressure: don't stack a second pipeline (and a second LLM bill)
+    # on top of one that is still running for this user. The lock is
+    # checked and taken before the first await — an await in between
+    # would let two quick messages both slip past the busy check
+    lock = get_user_lock(user_id)
+    if lock.locked():
+        await update.message.reply_text(
+            "⏳ Still working on your previous message — hold on!\n"
+            "I'll be ready for new business info once it's done."
+        )
+        return
 
     try:
-        # Perform research
-        research_data = await get_agent().research_business(message_text)
-
-        # Store research results
-        session["data"]["research"] = research_data
-        session["state"] = "research_complete"
+        async with lock:
+            await update.message.reply_text(
+                "📥 Received your business information!\n\n"
+                "🔍 Starting deep research...\n"
+                "• Analyzing your business\n"
+                "• Searching competitors & trends\n"
+                "• Gathering industry insights\n\n"
+                "⏳ This typically takes 30-60 seconds. Please wait."
+            )
+
+            research_data = await get_agent().research_business(message_text)
+
+            # Store research results
+            session["data"]["research"] = research_data
+            session["state"] = "research_complete"
 
         # Send research summary
         research_summary = research_data["research"]
 
-        if len(research_summary) > 4000:
-            chunks = [research_summary[i:i+4000] for i in range(0, len(research_summary), 4000)]
-            await update.message.reply_text("**✅ Research Complete!**\n\n(Results split into parts)")
-            for i, chunk in enumerate(chunks):
-                await update.message.reply_text(f"**Part {i+1}:**\n\n{chunk}")
-        else:
-            await update.message.reply_text(f"**✅ Research Complete!**\n\n{research_summary}")
+        await send_long_message(update.message, "**✅ Research Complete!**", research_summary)
 
         await update.message.reply_text(
             "**🎯 Next Steps:**\n"
@@ -404,10 +715,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show current session status."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
+    session = get_session(context)
 
-    if not session or session.get("state") == "waiting_for_info":
+    if session.get("state") == "waiting_for_info":
         await update.message.reply_text("📭 No active research. Send me business information to get started!")
     elif session.get("state") == "research_complete":
         await update.message.reply_text(
@@ -416,6 +726,12 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         )
 
 
+async def shutdown(application) -> None:
+    """Release the agent's HTTP resources on bot shutdown."""
+    if agent is not None:
+        await agent.aclose()
+
+
 def main() -> None:
     """Start the bot."""
     # Check for required environment variables
@@ -441,8 +757,26 @@ def main() -> None:
         print("   export GROQ_API_KEY='your-key-here'")
         return
 
-    # Create the Application
-    application = Application.builder().token(token).build()
+    # Create the Application; pace outbound requests under Telegram's
+    # 30 msg/s bot-wide and 20/min per-group limits instead of eating 429s
+    # Persist session state (including finished research) across
+    # restarts so users don't pay for the full pipeline again
+    persistence = PicklePersistence(filepath="./bot_state.pickle")
+
+    application = (
+        Application.builder()
+        .token(token)
+        .persistence(persistence)
+        .concurrent_updates(64)
+        .post_shutdown(shutdown)
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=25,
+            overall_time_period=1,
+            group_max_rate=18,
+            group_time_period=60
+        ))
+        .build()
+    )
 
     # Add handlers
     application.add_handler(CommandHandler("start", start))
@@ -2,20 +2,40 @@
 AI Client with Groq - optimized for rate limits.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
 import logging
-import time
+
+from cachetools import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Current Groq models (Dec 2025), tried in order
+DEFAULT_MODELS = (
+    ("llama-3.3-70b-versatile", 4000),
+    ("llama-3.1-8b-instant", 4000),
+    ("meta-llama/llama-4-scout-17b-16e-instruct", 4000),
+)
+
 
 class AIClient:
     """Groq AI client with rate limit handling."""
 
-    def __init__(self):
+    def __init__(self, throttle_seconds: float = 5.0, models=DEFAULT_MODELS):
         self.groq_key = os.getenv("GROQ_API_KEY")
         self.groq_client = None
+        self.throttle_seconds = throttle_seconds
+        self.models = models
         self.last_call = 0
+        self._throttle_lock = None
+        self._async_client = None
+        # Usage block from the most recent completion, for telemetry
+        self.last_usage = None
+        # Exact-match response cache: users iterating on the same brief
+        # re-trigger identical prompts, and a hit skips the LLM entirely
+        self._response_cache = LRUCache(maxsize=256)
 
         if self.groq_key:
             try:
@@ -25,62 +45,174 @@ class AIClient:
             except Exception as e:
                 logger.warning(f"Groq init failed: {e}")
 
+    def _get_async_client(self):
+        # Lazy: only the streaming path needs the async SDK client
+        if self._async_client is None and self.groq_key:
+            from groq import AsyncGroq
+            self._async_client = AsyncGroq(api_key=self.groq_key)
+        return self._async_client
+
+    def _get_throttle_lock(self) -> asyncio.Lock:
+        # Created lazily so the lock binds to the running event loop
+        if self._throttle_lock is None:
+            self._throttle_lock = asyncio.Lock()
+        return self._throttle_lock
+
+    async def _throttle(self):
+        """Wait out the inter-call gap without blocking the event loop."""
+        async with self._get_throttle_lock():
+            loop = asyncio.get_running_loop()
+            elapsed = loop.time() - self.last_call
+            if elapsed < self.throttle_seconds:
+                await asyncio.sleep(self.throttle_seconds - elapsed)
+            self.last_call = loop.time()
+
     async def generate(
         self,
         prompt: str,
         max_tokens: int = 4000,
         temperature: float = 0.7,
-        prefer_deepseek: bool = False
+        prefer_deepseek: bool = False,
+        system: str = None
     ) -> str:
-        """Generate with rate limit handling."""
+        """Generate with rate limit handling.
 
-        # Throttle requests (5s between calls to avoid rate limits)
-        elapsed = time.time() - self.last_call
-        if elapsed < 5:
-            time.sleep(5 - elapsed)
+        ``system`` carries the static instruction block as a separate
+        system message, ahead of the variable prompt, so the provider
+        sees a stable cacheable prefix across calls.
+        """
 
         # Truncate very long prompts
         if len(prompt) > 20000:
             prompt = prompt[:20000] + "\n\n[Content truncated for length]"
 
-        # Current Groq models (Dec 2025)
-        models = [
-            ("llama-3.3-70b-versatile", 4000),
-            ("llama-3.1-8b-instant", 4000),
-            ("meta-llama/llama-4-scout-17b-16e-instruct", 4000),
-        ]
+        # High-temperature calls are expected to vary run to run, so
+        # only the low-temperature ones go through the cache
+        cache_key = None
+        if temperature <= 0.5:
+            h = hashlib.sha256(prompt.encode())
+            h.update(b"\x00")
+            h.update((system or "").encode())
+            h.update(f"{max_tokens}:{temperature}".encode())
+            cache_key = h.digest()
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Response cache hit")
+                return cached
 
         errors = []
-        for model, tokens in models:
+        for model, tokens in self.models:
             try:
                 logger.info(f"Trying {model}")
-                self.last_call = time.time()
-                result = await self._generate(prompt, tokens, temperature, model)
+                await self._throttle()
+                result = await self._generate(prompt, tokens, temperature, model, system)
                 if result:
+                    if cache_key is not None:
+                        self._response_cache[cache_key] = result
                     return result
             except Exception as e:
                 err = str(e)[:80]
                 errors.append(f"{model}: {err}")
                 logger.warning(f"{model} failed: {err}")
                 if "429" in str(e):
-                    time.sleep(30)  # Longer wait on rate limit
+                    await asyncio.sleep(30)  # Longer wait on rate limit
+                continue
+
+        raise Exception(f"All failed: {errors}")
+
+    async def generate_stream(self, prompt: str, max_tokens: int = 4000,
+                              temperature: float = 0.7, system: str = None):
+        """Yield completion chunks as they arrive.
+
+        Walks the same model ladder as generate(), but a model can only
+        be swapped out before its first chunk is emitted — once tokens
+        have flowed, a mid-stream error propagates.
+        """
+        if len(prompt) > 20000:
+            prompt = prompt[:20000] + "\n\n[Content truncated for length]"
+
+        client = self._get_async_client()
+        if client is None:
+            raise Exception("Groq not configured")
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        errors = []
+        for model, tokens in self.models:
+            try:
+                logger.info(f"Trying {model} (stream)")
+                await self._throttle()
+                stream = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=min(max_tokens, tokens),
+                    temperature=temperature,
+                    stream=True
+                )
+            except Exception as e:
+                err = str(e)[:80]
+                errors.append(f"{model}: {err}")
+                logger.warning(f"{model} failed: {err}")
+                if "429" in str(e):
+                    await asyncio.sleep(30)  # Longer wait on rate limit
                 continue
 
+            last_chunk = None
+            async for chunk in stream:
+                last_chunk = chunk
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+            # Groq reports usage on the final stream chunk
+            x_groq = getattr(last_chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None):
+                self.last_usage = x_groq.usage
+            return
+
         raise Exception(f"All failed: {errors}")
 
-    async def generate_code(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.3) -> str:
-        return await self.generate(prompt, max_tokens, temperature)
+    async def generate_code(self, prompt: str, max_tokens: int = 4000, temperature: float = 0.3,
+                            system: str = None) -> str:
+        return await self.generate(prompt, max_tokens, temperature, system=system)
+
+    def generate_code_stream(self, prompt: str, max_tokens: int = 4000,
+                             temperature: float = 0.3, system: str = None):
+        return self.generate_stream(prompt, max_tokens, temperature, system=system)
 
-    async def _generate(self, prompt: str, max_tokens: int, temp: float, model: str) -> str:
+    async def _generate(self, prompt: str, max_tokens: int, temp: float, model: str,
+                        system: str = None) -> str:
         if not self.groq_client:
             raise Exception("Groq not configured")
-        r = self.groq_client.chat.completions.create(
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        # Run the sync SDK call in a worker thread so the HTTPS
+        # round-trip doesn't block the event loop
+        r = await asyncio.to_thread(
+            self.groq_client.chat.completions.create,
             model=model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             max_tokens=max_tokens,
             temperature=temp
         )
+        self.last_usage = getattr(r, "usage", None)
         return r.choices[0].message.content
 
     def get_status(self) -> dict:
         return {"groq": self.groq_client is not None}
+
+    @classmethod
+    def instance(cls) -> "AIClient":
+        """The process-wide client; same object get_client() returns."""
+        return get_client()
+
+
+@functools.cache
+def get_client() -> AIClient:
+    """Process-wide AIClient so every caller shares one connection pool
+    and one throttle state."""
+    return AIClient()
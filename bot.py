@@ -7,9 +7,11 @@ Fully automated: Business brief → Research → Generate → Deploy → Live UR
 
 import asyncio
 import os
-import io
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+import sys
+from cachetools import TTLCache
+from telegram import InputFile, Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.request import HTTPXRequest
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -42,65 +44,71 @@ logger = logging.getLogger(__name__)
     PROCESSING
 ) = range(11)
 
-# Store user sessions
-user_sessions = {}
+# Store user sessions; bounded so idle sessions expire instead of
+# keeping every brief and generated page alive forever
+user_sessions = TTLCache(maxsize=10_000, ttl=3600)
 
-# Lazy load modules
-_generator = None
-_code_generator = None
-_deployer = None
-_verifier = None
 
+def _is_skip(text: str) -> bool:
+    """Skip-check without lowercasing the whole message: the length
+    gate means a pasted multi-KB brief never pays for a .lower() copy."""
+    return len(text) == 4 and text.lower() == 'skip'
 
-def get_generator():
-    global _generator
-    if _generator is None:
-        from generators import LandingPageGenerator
-        _generator = LandingPageGenerator()
-    return _generator
 
+def get_session(user_id: int) -> dict:
+    """Fetch the user's session, lazily creating it (or re-creating it
+    after TTL eviction)."""
+    session = user_sessions.get(user_id)
+    if session is None:
+        user_sessions[user_id] = session = {"mode": None, "data": {}}
+    return session
 
-def get_code_generator():
-    global _code_generator
-    if _code_generator is None:
-        from code_generator import CodeGenerator
-        _code_generator = CodeGenerator()
-    return _code_generator
 
+# One pipeline per user at a time; same TTL bound as sessions so idle
+# locks are evicted rather than accumulating forever
+_user_locks = TTLCache(maxsize=10_000, ttl=3600)
 
-def get_deployer():
-    global _deployer
-    if _deployer is None:
-        from deployer import CloudflareDeployer
-        _deployer = CloudflareDeployer()
-    return _deployer
 
+def _lock_for(user_id: int) -> asyncio.Lock:
+    lock = _user_locks.get(user_id)
+    if lock is None:
+        _user_locks[user_id] = lock = asyncio.Lock()
+    return lock
 
-def get_verifier():
-    global _verifier
-    if _verifier is None:
-        from deployer import SiteVerifier
-        _verifier = SiteVerifier()
-    return _verifier
+# Lazy-loaded singletons via PEP 562: the first access of
+# _module.<name> runs __getattr__, which stores the instance in
+# globals(), so every later access is a plain dict hit
+_module = sys.modules[__name__]
 
 
-# ============== COMMAND HANDLERS ==============
+def __getattr__(name):
+    if name == "generator":
+        from generators import LandingPageGenerator
+        value = LandingPageGenerator()
+    elif name == "code_generator":
+        from code_generator import CodeGenerator
+        value = CodeGenerator()
+    elif name == "deployer":
+        from deployer import CloudflareDeployer
+        value = CloudflareDeployer()
+    elif name == "verifier":
+        from deployer import SiteVerifier
+        value = SiteVerifier()
+    else:
+        raise AttributeError(name)
+    globals()[name] = value
+    return value
 
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """Welcome message with options."""
-    user_id = update.effective_user.id
-    user_sessions[user_id] = {"mode": None, "data": {}}
 
-    deployer = get_deployer()
-    deploy_status = "✅" if deployer.is_configured else "❌"
+# ============== COMMAND HANDLERS ==============
 
-    keyboard = [
-        [InlineKeyboardButton("📝 Paste Everything", callback_data="mode_freeform")],
-        [InlineKeyboardButton("💬 Guided Questions", callback_data="mode_guided")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+# Immutable, so build them once instead of on every /start
+_START_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📝 Paste Everything", callback_data="mode_freeform")],
+    [InlineKeyboardButton("💬 Guided Questions", callback_data="mode_guided")]
+])
 
-    welcome = f"""🚀 **Landing Page Maker**
+_WELCOME_TPL = """🚀 **Landing Page Maker**
 
 Send me your business info and I'll create a **live website** for you!
 
@@ -119,13 +127,22 @@ Send me your business info and I'll create a **live website** for you!
 
 **Choose input method:**"""
 
-    await update.message.reply_text(welcome, reply_markup=reply_markup, parse_mode='Markdown')
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Welcome message with options."""
+    session = get_session(update.effective_user.id)
+    session["mode"] = None
+    session["data"] = {}
+
+    await update.message.reply_text(
+        _WELCOME_TPL.format(deploy_status=context.bot_data["deploy_status"]),
+        reply_markup=_START_KB,
+        parse_mode='Markdown'
+    )
     return ConversationHandler.END
 
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Show help."""
-    help_text = """**Commands:**
+_HELP_TEXT = sys.intern("""**Commands:**
 /start - Create new landing page
 /status - Check session
 /clear - Clear session
@@ -145,23 +162,26 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 • **LIVE URL** - Deployed website!
 
 **Powered by:**
-DeepSeek + Groq + Cloudflare (all free)"""
+DeepSeek + Groq + Cloudflare (all free)""")
 
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show help."""
+    await update.message.reply_text(_HELP_TEXT, parse_mode='Markdown')
 
 
 async def clear_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Clear user session."""
-    user_id = update.effective_user.id
-    user_sessions[user_id] = {"mode": None, "data": {}}
+    session = get_session(update.effective_user.id)
+    session["mode"] = None
+    session["data"] = {}
     await update.message.reply_text("✅ Session cleared. Use /start to begin.")
     return ConversationHandler.END
 
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Show session status."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
+    session = get_session(update.effective_user.id)
 
     if not session.get("data"):
         await update.message.reply_text("📭 No active session. Use /start to begin.")
@@ -180,8 +200,11 @@ async def mode_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user_id = query.from_user.id
     mode = query.data
 
+    session = get_session(user_id)
+
     if mode == "mode_freeform":
-        user_sessions[user_id] = {"mode": "freeform", "data": {}}
+        session["mode"] = "freeform"
+        session["data"] = {}
         await query.edit_message_text(
             "📝 **Paste your business info:**\n\n"
             "Include as much as possible:\n"
@@ -199,7 +222,9 @@ async def mode_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return PROCESSING
 
     elif mode == "mode_guided":
-        user_sessions[user_id] = {"mode": "guided", "data": {}}
+        session["mode"] = "guided"
+        session["data"] = {}
+        session["step"] = 0
         await query.edit_message_text(
             "💬 **Guided Mode**\n\n"
             "I'll ask questions one by one.\n"
@@ -214,88 +239,90 @@ async def mode_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 # ============== GUIDED MODE ==============
 
-async def receive_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["business_name"] = update.message.text
-    await update.message.reply_text("**Q2/10:** Website URL? (or 'skip')", parse_mode='Markdown')
-    return WAITING_WEBSITE
-
-async def receive_website(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["website"] = update.message.text
-    await update.message.reply_text("**Q3/10:** What industry/niche?", parse_mode='Markdown')
-    return WAITING_INDUSTRY
-
-async def receive_industry(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["industry"] = update.message.text
-    await update.message.reply_text("**Q4/10:** Who is your target customer?", parse_mode='Markdown')
-    return WAITING_TARGET
-
-async def receive_target(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["target_customer"] = update.message.text
-    await update.message.reply_text("**Q5/10:** What do you sell/offer?", parse_mode='Markdown')
-    return WAITING_OFFER
-
-async def receive_offer(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["main_offer"] = update.message.text
-    await update.message.reply_text("**Q6/10:** Goal of the page? (leads, sales, bookings)", parse_mode='Markdown')
-    return WAITING_GOAL
+# One row per question: (field stored, next prompt, next state). The
+# terminal row hands off to the pipeline instead of asking again.
+_GUIDED_STEPS = [
+    (field, sys.intern(prompt) if prompt else None, state)
+    for field, prompt, state in (
+        ("business_name", "**Q2/10:** Website URL? (or 'skip')", WAITING_WEBSITE),
+        ("website", "**Q3/10:** What industry/niche?", WAITING_INDUSTRY),
+        ("industry", "**Q4/10:** Who is your target customer?", WAITING_TARGET),
+        ("target_customer", "**Q5/10:** What do you sell/offer?", WAITING_OFFER),
+        ("main_offer", "**Q6/10:** Goal of the page? (leads, sales, bookings)", WAITING_GOAL),
+        ("page_goal", "**Q7/10:** Brand tone? (professional, friendly, luxurious, playful)", WAITING_TONE),
+        ("brand_tone", "**Q8/10:** Brand colors? (e.g., 'blue #1a73e8, white')", WAITING_COLORS),
+        ("colors", "**Q9/10:** Sites you like the style of?", WAITING_EXAMPLES),
+        ("example_sites", "**Q10/10:** Anything else important?", WAITING_ADDITIONAL),
+        ("additional", None, None),
+    )
+]
 
-async def receive_goal(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["page_goal"] = update.message.text
-    await update.message.reply_text("**Q7/10:** Brand tone? (professional, friendly, luxurious, playful)", parse_mode='Markdown')
-    return WAITING_TONE
 
-async def receive_tone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["brand_tone"] = update.message.text
-    await update.message.reply_text("**Q8/10:** Brand colors? (e.g., 'blue #1a73e8, white')", parse_mode='Markdown')
-    return WAITING_COLORS
+async def receive_step(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Handle every guided-mode answer via the _GUIDED_STEPS table."""
+    session = get_session(update.effective_user.id)
+    data = session["data"]
+    idx = min(session.get("step", 0), len(_GUIDED_STEPS) - 1)
+    field, next_prompt, next_state = _GUIDED_STEPS[idx]
 
-async def receive_colors(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["colors"] = update.message.text
-    await update.message.reply_text("**Q9/10:** Sites you like the style of?", parse_mode='Markdown')
-    return WAITING_EXAMPLES
+    text = update.message.text
+    if not _is_skip(text):
+        data[field] = text
+    session["step"] = idx + 1
 
-async def receive_examples(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["example_sites"] = update.message.text
-    await update.message.reply_text("**Q10/10:** Anything else important?", parse_mode='Markdown')
-    return WAITING_ADDITIONAL
+    if next_state is None:
+        brief = "\n".join([f"{k}: {v}" for k, v in data.items() if v])
+        await update.message.reply_text("✅ Got it! Starting generation...")
+        await process_and_deploy(update, context, brief)
+        return ConversationHandler.END
 
-async def receive_additional(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    user_id = update.effective_user.id
-    if update.message.text.lower() != 'skip':
-        user_sessions[user_id]["data"]["additional"] = update.message.text
+    await update.message.reply_text(next_prompt, parse_mode='Markdown')
+    return next_state
 
-    data = user_sessions[user_id]["data"]
-    brief = "\n".join([f"{k}: {v}" for k, v in data.items() if v])
 
-    await update.message.reply_text("✅ Got it! Starting generation...")
-    await process_and_deploy(update, context, brief)
-    return ConversationHandler.END
+# ============== MAIN PROCESSING ==============
 
+class StatusThrottle:
+    """Coalesce status-message edits: bursts of progress ticks collapse
+    into at most one editMessageText per interval, latest text wins, so
+    Telegram's editMessageText rate limit never stalls the pipeline."""
+
+    def __init__(self, msg, min_interval: float = 1.5):
+        self.msg = msg
+        self.min_interval = min_interval
+        self.last = 0.0
+        self.pending = None
+        self.task = None
+
+    async def set(self, text: str) -> None:
+        self.pending = text
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flush())
+
+    def cancel(self) -> None:
+        """Drop any queued edit (used before the final result message)."""
+        self.pending = None
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self.pending is not None:
+            delay = self.min_interval - (loop.time() - self.last)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            text, self.pending = self.pending, None
+            try:
+                await self.msg.edit_text(text, parse_mode='Markdown')
+            except Exception:
+                pass
+            self.last = loop.time()
 
-# ============== MAIN PROCESSING ==============
 
 async def handle_freeform(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle free-form input."""
-    user_id = update.effective_user.id
-    session = user_sessions.get(user_id, {})
+    session = get_session(update.effective_user.id)
 
     if session.get("mode") != "freeform":
         await update.message.reply_text("Use /start to begin.")
@@ -307,36 +334,51 @@ async def handle_freeform(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE, brief: str) -> None:
-    """Full pipeline: research → plan → code → deploy → send URL."""
+    """Full pipeline: research → plan → code → deploy → send URL.
+
+    Serialized per user: a second trigger while a pipeline is running
+    gets a notice instead of burning a duplicate LLM + deploy run.
+    """
     user_id = update.effective_user.id
     chat_id = update.effective_chat.id
 
+    lock = _lock_for(user_id)
+    if lock.locked():
+        await update.message.reply_text(
+            "⏳ Previous generation is still running — I'll only build one site at a time."
+        )
+        return
+
+    async with lock:
+        await _run_pipeline(update, context, brief, user_id, chat_id)
+
+
+async def _run_pipeline(update: Update, context: ContextTypes.DEFAULT_TYPE,
+                        brief: str, user_id: int, chat_id: int) -> None:
     status_msg = await update.message.reply_text(
         "🚀 **Starting Full Pipeline**\n\n"
         "⏳ Step 1/6: Analyzing business info...",
         parse_mode='Markdown'
     )
 
+    throttle = StatusThrottle(status_msg)
+
     async def update_status(step: int, msg: str):
-        try:
-            await status_msg.edit_text(
-                f"🚀 **Building Your Website**\n\n"
-                f"{'✅' if step > 1 else '⏳'} Step 1/6: Analyze business\n"
-                f"{'✅' if step > 2 else '⏳' if step >= 2 else '⬜'} Step 2/6: Research industry\n"
-                f"{'✅' if step > 3 else '⏳' if step >= 3 else '⬜'} Step 3/6: Create plan\n"
-                f"{'✅' if step > 4 else '⏳' if step >= 4 else '⬜'} Step 4/6: Design system\n"
-                f"{'✅' if step > 5 else '⏳' if step >= 5 else '⬜'} Step 5/6: Generate code\n"
-                f"{'✅' if step > 6 else '⏳' if step >= 6 else '⬜'} Step 6/6: Deploy\n\n"
-                f"📍 {msg}",
-                parse_mode='Markdown'
-            )
-        except:
-            pass
+        await throttle.set(
+            f"🚀 **Building Your Website**\n\n"
+            f"{'✅' if step > 1 else '⏳'} Step 1/6: Analyze business\n"
+            f"{'✅' if step > 2 else '⏳' if step >= 2 else '⬜'} Step 2/6: Research industry\n"
+            f"{'✅' if step > 3 else '⏳' if step >= 3 else '⬜'} Step 3/6: Create plan\n"
+            f"{'✅' if step > 4 else '⏳' if step >= 4 else '⬜'} Step 4/6: Design system\n"
+            f"{'✅' if step > 5 else '⏳' if step >= 5 else '⬜'} Step 5/6: Generate code\n"
+            f"{'✅' if step > 6 else '⏳' if step >= 6 else '⬜'} Step 6/6: Deploy\n\n"
+            f"📍 {msg}"
+        )
 
     try:
         # Step 1-4: Generate plan and design system
         await update_status(1, "Extracting business info...")
-        generator = get_generator()
+        generator = _module.generator
 
         # Custom progress callback
         current_step = [1]
@@ -353,9 +395,18 @@ async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
         # Step 5: Generate website code
         await update_status(5, "Generating website with DeepSeek...")
-        code_gen = get_code_generator()
+        code_gen = _module.code_generator
+
+        from generators import format_business_info
+        business_text = format_business_info(business_info)
 
-        business_text = "\n".join([f"{k}: {v}" for k, v in business_info.items()])
+        # The sandbox scaffold doesn't depend on the generated component,
+        # so prepare it up front; only the injection is left after the
+        # long LLM call
+        from codesandbox_deployer import CodeSandboxDeployer
+        deployer = CodeSandboxDeployer()
+        business_name = business_info.get('business_name', 'Landing Page')
+        files = deployer.create_next_project_shell(business_name)
 
         async def code_progress(msg):
             await update_status(5, msg)
@@ -364,12 +415,7 @@ async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
         # Step 6: Deploy to CodeSandbox
         await update_status(6, "Creating CodeSandbox...")
-
-        from codesandbox_deployer import CodeSandboxDeployer
-        deployer = CodeSandboxDeployer()
-
-        business_name = business_info.get('business_name', 'Landing Page')
-        files = deployer.create_next_project(react_code, business_name)
+        files["components/LandingPage.jsx"] = react_code
         deployment = await deployer.deploy(files, business_name)
 
         sandbox_url = deployment.get("editor_url", "")
@@ -378,11 +424,21 @@ async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE,
         # Send files
         await update_status(7, "Sending files...")
 
-        react_file = io.BytesIO(react_code.encode('utf-8'))
-        react_file.name = "LandingPage.jsx"
-        await context.bot.send_document(chat_id=chat_id, document=react_file, caption="React Component")
+        await context.bot.send_document(
+            chat_id=chat_id,
+            document=InputFile(react_code.encode('utf-8'), filename="LandingPage.jsx"),
+            caption="React Component"
+        )
+
+        # Keep only the URL in the session so the multi-KB brief and
+        # generated code are released once the pipeline is done
+        session = get_session(user_id)
+        session["deployed_url"] = preview_url or sandbox_url
+        session["mode"] = None
+        session["data"] = {}
 
         # Final message with links
+        throttle.cancel()
         await status_msg.edit_text(
             f"React Landing Page Ready!\n\n"
             f"Editor: {sandbox_url}\n\n"
@@ -393,6 +449,7 @@ async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE,
     except Exception as e:
         logger.error(f"Pipeline error: {e}")
         error_msg = str(e)[:200]
+        throttle.cancel()
         await status_msg.edit_text(
             f"Error: {error_msg}\n\nPlease try /start again."
         )
@@ -400,6 +457,15 @@ async def process_and_deploy(update: Update, context: ContextTypes.DEFAULT_TYPE,
 
 # ============== MAIN ==============
 
+async def _post_shutdown(application) -> None:
+    """Close the deployers' shared HTTP pools on exit (only if their
+    modules were actually imported)."""
+    for mod_name in ("deployer", "codesandbox_deployer"):
+        mod = sys.modules.get(mod_name)
+        if mod is not None:
+            await mod.aclose()
+
+
 def main() -> None:
     """Start the bot."""
     token = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -423,7 +489,29 @@ def main() -> None:
     print(f"   Gemini: {'✅' if gemini_key else '❌'}")
     print(f"   Cloudflare: {'✅' if (cf_token and cf_account) else '❌'}")
 
-    application = Application.builder().token(token).build()
+    # One keep-alive HTTP/2 pool for all Bot API traffic, so status
+    # edits and document uploads reuse connections instead of paying a
+    # TLS handshake each
+    request = HTTPXRequest(
+        connection_pool_size=32,
+        http_version="2",
+        connect_timeout=5.0,
+        read_timeout=30.0,
+    )
+    application = (
+        Application.builder()
+        .token(token)
+        .request(request)
+        .get_updates_request(
+            HTTPXRequest(connection_pool_size=2, http_version="2", read_timeout=30.0)
+        )
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
+
+    # Resolved from env once at startup; /start just reads it instead of
+    # cold-importing the deployer to ask is_configured
+    application.bot_data["deploy_status"] = "✅" if (cf_token and cf_account) else "❌"
 
     conv_handler = ConversationHandler(
         entry_points=[
@@ -431,16 +519,15 @@ def main() -> None:
             CallbackQueryHandler(mode_selection, pattern="^mode_"),
         ],
         states={
-            WAITING_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_name)],
-            WAITING_WEBSITE: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_website)],
-            WAITING_INDUSTRY: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_industry)],
-            WAITING_TARGET: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_target)],
-            WAITING_OFFER: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_offer)],
-            WAITING_GOAL: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_goal)],
-            WAITING_TONE: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_tone)],
-            WAITING_COLORS: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_colors)],
-            WAITING_EXAMPLES: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_examples)],
-            WAITING_ADDITIONAL: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_additional)],
+            **{
+                state: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_step)]
+                for state in (
+                    WAITING_NAME, WAITING_WEBSITE, WAITING_INDUSTRY,
+                    WAITING_TARGET, WAITING_OFFER, WAITING_GOAL,
+                    WAITING_TONE, WAITING_COLORS, WAITING_EXAMPLES,
+                    WAITING_ADDITIONAL,
+                )
+            },
             PROCESSING: [MessageHandler(filters.TEXT & ~filters.COMMAND, handle_freeform)],
         },
         fallbacks=[CommandHandler("clear", clear_session), CommandHandler("start", start)],
@@ -3,39 +3,43 @@ React Landing Page Generator - Creates Next.js/React components.
 """
 
 import logging
-from ai_client import AIClient
+import re
 
-logger = logging.getLogger(__name__)
+from ai_client import get_client
+from design_tokens import COLOR_PALETTES, get_palette_module
 
-REACT_PROMPT = '''Create a React landing page component for this business:
+logger = logging.getLogger(__name__)
 
-{business_info}
+# Static instruction block sent as the system message: byte-identical
+# across calls, so it forms a stable provider-cacheable prefix ahead of
+# the per-business user message
+REACT_SYSTEM_PROMPT = '''You create React landing page components.
 
 Requirements:
 - Export default function LandingPage()
 - Use Tailwind CSS for styling
 - Include: Hero, Features (3 cards), Testimonials, CTA, Footer
-- Use Lucide React icons: import {{ Star, Check, ArrowRight }} from 'lucide-react'
+- Use Lucide React icons: import { Star, Check, ArrowRight } from 'lucide-react'
 - Professional design with proper spacing (py-20, px-6)
 - Responsive (mobile-first)
 - Modern colors: primary-600, neutral-900, neutral-600
 
 Example structure:
 ```jsx
-import {{ Star, Check, ArrowRight, Menu, X }} from 'lucide-react'
-import {{ useState }} from 'react'
+import { Star, Check, ArrowRight, Menu, X } from 'lucide-react'
+import { useState } from 'react'
 
-export default function LandingPage() {{
+export default function LandingPage() {
   const [mobileMenuOpen, setMobileMenuOpen] = useState(false)
 
   return (
     <div className="min-h-screen bg-white">
-      {{/* Navigation */}}
+      {/* Navigation */}
       <nav className="fixed top-0 w-full bg-white/80 backdrop-blur-md z-50 border-b">
         ...
       </nav>
 
-      {{/* Hero */}}
+      {/* Hero */}
       <section className="pt-32 pb-20 px-6">
         <div className="max-w-6xl mx-auto text-center">
           <h1 className="text-5xl md:text-6xl font-bold text-neutral-900 mb-6">
@@ -50,45 +54,97 @@ export default function LandingPage() {{
         </div>
       </section>
 
-      {{/* Features */}}
+      {/* Features */}
       <section className="py-20 bg-neutral-50 px-6">
         <div className="max-w-6xl mx-auto">
           <h2 className="text-3xl font-bold text-center mb-12">Features</h2>
           <div className="grid md:grid-cols-3 gap-8">
-            {{/* Feature cards */}}
+            {/* Feature cards */}
           </div>
         </div>
       </section>
 
-      {{/* More sections... */}}
+      {/* More sections... */}
 
-      {{/* Footer */}}
+      {/* Footer */}
       <footer className="bg-neutral-900 text-white py-12 px-6">
         ...
       </footer>
     </div>
   )
-}}
+}
 ```
 
 Output ONLY the complete React component code. Start with imports, end with export.
-No explanations. No markdown code blocks. Just the JSX code.
+No explanations. No markdown code blocks. Just the JSX code.'''
+
+
+REACT_USER_TEMPLATE = '''Create a React landing page component for this business:
+
+{business_info}
 
 Generate now for: {business_name}'''
 
 
+# Sentinels used to pre-render the template once; see CodeGenerator.__init__
+_INFO_SLOT = "\x00BUSINESS_INFO\x00"
+_NAME_SLOT = "\x00BUSINESS_NAME\x00"
+
+COMPLETION_PROMPT = '''This React component was cut off mid-generation. Continue it from exactly where it stops so the component ends up complete and valid JSX.
+
+Output ONLY the continuation code. No markdown. No explanations. Do not repeat any code that is already there.
+
+Last part of the component:
+
+{tail}'''
+
+
+# Truncation/placeholder markers and required structure, each checked in a
+# single regex pass instead of a chain of case-folded substring scans
+_INCOMPLETE_RE = re.compile(
+    r"//\s*rest of|/\*\s*rest of|\[MORE|TODO:|\{/\*\s*More sections",
+    re.I,
+)
+_REQUIRED_RE = re.compile(
+    r"export default|<nav|<section|<footer|</div>",
+    re.I,
+)
+
+# Fenced block with optional language tag; one DOTALL pass pulls the
+# contents whether or not the closing fence survived truncation
+_FENCE_RE = re.compile(r'```(?:jsx|javascript)?\n?(.*?)(?:```|$)', re.S)
+
+# Business name sits on a "Name: ..." line; one anchored regex pass
+# instead of lowercasing every line in a Python loop
+_NAME_RE = re.compile(r'(?im)^[^:\n]*name[^:\n]*:\s*(.+)$')
+
+
 class CodeGenerator:
     """Generate React landing pages."""
 
     def __init__(self):
-        self.ai = AIClient()
+        self.ai = get_client()
+        # Render the user template exactly once, then keep the static
+        # pieces around the two dynamic slots so each request is a plain
+        # 5-way string concat
+        rendered = REACT_USER_TEMPLATE.format(business_info=_INFO_SLOT, business_name=_NAME_SLOT)
+        head, rest = rendered.split(_INFO_SLOT)
+        mid, tail = rest.split(_NAME_SLOT)
+        self._prompt_parts = (head, mid, tail)
+        # One fully-assembled system prompt per palette; each variant is
+        # byte-identical across calls so the provider can cache it
+        self._system_prompts = {
+            name: REACT_SYSTEM_PROMPT + "\n\n" + get_palette_module(name)
+            for name in COLOR_PALETTES
+        }
 
     async def generate_website(
         self,
         business_info: str,
         plan: str,
         design_system: str,
-        progress_callback=None
+        progress_callback=None,
+        palette: str = "modern"
     ) -> str:
         """Generate a React landing page component."""
 
@@ -98,42 +154,112 @@ class CodeGenerator:
 
         await update("Generating React component...")
 
+        # Slice once; both the name extraction and the prompt use it
+        info = business_info[:2000]
+
         # Extract business name
-        business_name = "Landing Page"
-        for line in business_info.split('\n'):
-            if 'name' in line.lower():
-                business_name = line.split(':')[-1].strip()
-                break
+        m = _NAME_RE.search(info)
+        business_name = m.group(1).strip() if m else "Landing Page"
+
+        # Short user message assembled from the pre-rendered pieces; the
+        # heavy static instructions ride in the system message
+        head, mid, tail = self._prompt_parts
+        prompt = "".join((head, info, mid, business_name, tail))
 
-        # Shorter prompt
-        prompt = REACT_PROMPT.format(
-            business_info=business_info[:2000],
-            business_name=business_name
-        )
+        system = self._system_prompts.get(palette, self._system_prompts["modern"])
 
-        code = await self.ai.generate_code(prompt, max_tokens=4000, temperature=0.4)
-        code = self._clean_code(code)
+        # Stream the completion: chunks land in a list (joined once at
+        # the end) and progress ticks go out every ~2KB of code
+        parts = []
+        total = 0
+        next_tick = 2000
+        async for chunk in self.ai.generate_code_stream(
+            prompt, max_tokens=4000, temperature=0.4, system=system
+        ):
+            parts.append(chunk)
+            total += len(chunk)
+            if total >= next_tick:
+                next_tick = total + 2000
+                await update(f"Generating React component... {total} chars")
+
+        code = self._clean_code("".join(parts))
+
+        usage = self.ai.last_usage
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", 0) or 0
+            logger.info(
+                "Generation tokens: %s prompt (%s cached), %s completion",
+                getattr(usage, "prompt_tokens", "?"), cached,
+                getattr(usage, "completion_tokens", "?")
+            )
+
+        if not self._is_complete(code):
+            logger.warning("Generated component looks incomplete (%d chars)", len(code))
+            await update("Completing truncated component...")
+            code = await self._complete_code(code)
 
         await update("React component generated!")
-        logger.info(f"Generated React: {len(code)} chars")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated React: %d chars, %d lines", len(code), code.count("\n"))
+        else:
+            logger.info("Generated React: %d chars", len(code))
 
         return code
 
+    async def _complete_code(self, code: str) -> str:
+        """Finish a truncated component by sending only its tail — not
+        the full generation prompt — and appending the continuation."""
+        tail = code[-3000:]
+        try:
+            continuation = await self.ai.generate_code(
+                COMPLETION_PROMPT.format(tail=tail),
+                max_tokens=2000,
+                temperature=0.2
+            )
+        except Exception as e:
+            logger.warning("Completion pass failed: %s", str(e)[:80])
+            return code
+
+        # Strip fences only; _clean_code would cut to the first import,
+        # which a continuation doesn't have
+        _, sep, rest = continuation.partition("```")
+        if sep:
+            continuation = rest.partition("\n")[2].partition("```")[0]
+        continuation = continuation.strip()
+        if not continuation:
+            return code
+        return code + "\n" + continuation
+
+    def _is_complete(self, code: str) -> bool:
+        """Check the component has all sections and no truncation markers."""
+        if len(code) < 500:
+            return False
+        if _INCOMPLETE_RE.search(code):
+            return False
+        found = {m.group(0).lower() for m in _REQUIRED_RE.finditer(code)}
+        return len(found) >= 4
+
     def _clean_code(self, code: str) -> str:
         """Clean generated code."""
-        # Remove markdown
-        if "```jsx" in code:
-            code = code.split("```jsx", 1)[-1]
-        if "```javascript" in code:
-            code = code.split("```javascript", 1)[-1]
-        if "```" in code:
-            code = code.split("```")[0]
+        # Single regex pass: grab the fenced block's contents if the
+        # model wrapped its output. A fence preceded by real code is a
+        # stray closing one — there the component is what comes before
+        # the fence, not after it
+        m = _FENCE_RE.search(code)
+        if m:
+            inner = m.group(1)
+            if "import" in inner or not code[:m.start()].strip():
+                code = inner
+            else:
+                code = code[:m.start()]
 
         code = code.strip()
 
         # Ensure it starts with import
         if not code.startswith("import"):
-            if "import" in code:
-                code = code[code.index("import"):]
+            i = code.find("import")
+            if i != -1:
+                code = code[i:]
 
         return code
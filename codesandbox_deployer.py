@@ -2,116 +2,58 @@
 CodeSandbox Deployer - Creates React sandboxes via API.
 """
 
+import asyncio
+import functools
 import logging
 import httpx
-import json
+import orjson
 import lzstring
 from typing import Dict
 
 logger = logging.getLogger(__name__)
 
+# The pure-Python compressor keeps per-instance dictionaries; build it
+# once instead of per deploy
+_LZ = lzstring.LZString()
 
-class CodeSandboxDeployer:
-    """Deploy React projects to CodeSandbox."""
+# One keep-alive pool for the CodeSandbox API instead of a fresh client
+# (and TLS handshake) per deploy
+_client = None
 
-    def __init__(self):
-        self.api_url = "https://codesandbox.io/api/v1/sandboxes/define"
 
-    async def deploy(self, files: Dict[str, str], title: str = "Landing Page") -> Dict:
-        """
-        Deploy files to CodeSandbox.
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=60.0)
+    return _client
 
-        Args:
-            files: Dict of {filepath: content}
-            title: Sandbox title
 
-        Returns:
-            Dict with sandbox_id and urls
-        """
-        # Create the sandbox definition
-        sandbox_def = {
-            "files": {}
-        }
+async def aclose():
+    """Close the shared client (shutdown hook)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-        for path, content in files.items():
-            sandbox_def["files"][path] = {"content": content}
 
-        # Add package.json if not present
-        if "package.json" not in files:
-            sandbox_def["files"]["package.json"] = {
-                "content": json.dumps({
-                    "name": title.lower().replace(" ", "-"),
-                    "private": True,
-                    "scripts": {
-                        "dev": "next dev",
-                        "build": "next build",
-                        "start": "next start"
-                    },
-                    "dependencies": {
-                        "next": "14.0.0",
-                        "react": "18.2.0",
-                        "react-dom": "18.2.0",
-                        "tailwindcss": "3.3.0",
-                        "autoprefixer": "10.4.16",
-                        "postcss": "8.4.31",
-                        "lucide-react": "^0.294.0",
-                        "clsx": "^2.0.0",
-                        "tailwind-merge": "^2.0.0"
-                    }
-                }, indent=2)
-            }
-
-        # Compress and encode for URL
-        compressed = lzstring.LZString().compressToBase64(json.dumps(sandbox_def))
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Use POST with JSON
-            response = await client.post(
-                self.api_url,
-                json={"json": 1, **sandbox_def},
-                headers={"Content-Type": "application/json"}
-            )
-
-            if response.status_code not in [200, 201]:
-                # Try URL method
-                sandbox_url = f"https://codesandbox.io/api/v1/sandboxes/define?json=1&parameters={compressed}"
-                response = await client.get(sandbox_url)
+# The scaffold is constant apart from package.json's name field; build
+# the static files and the index page once at import
+_STATIC_FILES = {
+    "pages/index.js": '''import LandingPage from '../components/LandingPage'
 
-            if response.status_code not in [200, 201]:
-                logger.error(f"CodeSandbox error: {response.text}")
-                raise Exception(f"CodeSandbox API failed: {response.status_code}")
-
-            data = response.json()
-            sandbox_id = data.get("sandbox_id")
-
-            return {
-                "success": True,
-                "sandbox_id": sandbox_id,
-                "editor_url": f"https://codesandbox.io/s/{sandbox_id}",
-                "preview_url": f"https://{sandbox_id}.csb.app",
-                "embed_url": f"https://codesandbox.io/embed/{sandbox_id}"
-            }
-
-    def create_next_project(self, component_code: str, title: str = "Landing Page") -> Dict[str, str]:
-        """Create a complete Next.js project structure."""
-
-        files = {
-            "pages/index.js": f'''import LandingPage from '../components/LandingPage'
-
-export default function Home() {{
+export default function Home() {
   return <LandingPage />
-}}
+}
 ''',
-            "components/LandingPage.jsx": component_code,
 
-            "pages/_app.js": '''import '../styles/globals.css'
+    "pages/_app.js": '''import '../styles/globals.css'
 
 export default function App({ Component, pageProps }) {
   return <Component {...pageProps} />
 }
 ''',
 
-            "styles/globals.css": '''@tailwind base;
+    "styles/globals.css": '''@tailwind base;
 @tailwind components;
 @tailwind utilities;
 
@@ -120,7 +62,7 @@ export default function App({ Component, pageProps }) {
 }
 ''',
 
-            "tailwind.config.js": '''/** @type {import('tailwindcss').Config} */
+    "tailwind.config.js": '''/** @type {import('tailwindcss').Config} */
 module.exports = {
   content: [
     './pages/**/*.{js,jsx}',
@@ -148,7 +90,7 @@ module.exports = {
 }
 ''',
 
-            "postcss.config.js": '''module.exports = {
+    "postcss.config.js": '''module.exports = {
   plugins: {
     tailwindcss: {},
     autoprefixer: {},
@@ -156,31 +98,120 @@ module.exports = {
 }
 ''',
 
-            "package.json": json.dumps({
-                "name": title.lower().replace(" ", "-"),
-                "private": True,
-                "scripts": {
-                    "dev": "next dev",
-                    "build": "next build",
-                    "start": "next start"
-                },
-                "dependencies": {
-                    "next": "14.0.0",
-                    "react": "18.2.0",
-                    "react-dom": "18.2.0",
-                    "tailwindcss": "3.3.0",
-                    "autoprefixer": "10.4.16",
-                    "postcss": "8.4.31",
-                    "lucide-react": "^0.294.0"
-                }
-            }, indent=2),
-
-            "next.config.js": '''/** @type {import('next').NextConfig} */
+    "next.config.js": '''/** @type {import('next').NextConfig} */
 const nextConfig = {
   reactStrictMode: true,
 }
 module.exports = nextConfig
-'''
+''',
+}
+
+
+_DEPS_MINIMAL = {
+    "next": "14.0.0",
+    "react": "18.2.0",
+    "react-dom": "18.2.0",
+    "tailwindcss": "3.3.0",
+    "autoprefixer": "10.4.16",
+    "postcss": "8.4.31",
+    "lucide-react": "^0.294.0",
+}
+
+_DEPS_FULL = {
+    **_DEPS_MINIMAL,
+    "clsx": "^2.0.0",
+    "tailwind-merge": "^2.0.0",
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _pkg_json(title: str, full: bool = False) -> str:
+    """package.json for a title; cached since titles repeat across
+    retries of the same business."""
+    return orjson.dumps({
+        "name": title.lower().replace(" ", "-"),
+        "private": True,
+        "scripts": {
+            "dev": "next dev",
+            "build": "next build",
+            "start": "next start"
+        },
+        "dependencies": _DEPS_FULL if full else _DEPS_MINIMAL
+    }, option=orjson.OPT_INDENT_2).decode()
+
+
+class CodeSandboxDeployer:
+    """Deploy React projects to CodeSandbox."""
+
+    def __init__(self):
+        self.api_url = "https://codesandbox.io/api/v1/sandboxes/define"
+
+    async def deploy(self, files: Dict[str, str], title: str = "Landing Page") -> Dict:
+        """
+        Deploy files to CodeSandbox.
+
+        Args:
+            files: Dict of {filepath: content}
+            title: Sandbox title
+
+        Returns:
+            Dict with sandbox_id and urls
+        """
+        # Create the sandbox definition
+        sandbox_def = {
+            "files": {}
         }
 
+        for path, content in files.items():
+            sandbox_def["files"][path] = {"content": content}
+
+        # Add package.json if not present
+        if "package.json" not in files:
+            sandbox_def["files"]["package.json"] = {"content": _pkg_json(title, full=True)}
+
+        client = get_http_client()
+        # Use POST with JSON
+        response = await client.post(
+                self.api_url,
+                json={"json": 1, **sandbox_def},
+            headers={"Content-Type": "application/json"}
+        )
+
+        if response.status_code not in [200, 201]:
+            # Fall back to the GET endpoint, which wants the whole
+            # definition lz-compressed into a URL parameter. Only
+            # this branch pays for the compression; lzstring is
+            # pure Python and slow on multi-KB payloads, so keep
+            # it off the event loop
+            compressed = await asyncio.to_thread(
+                _LZ.compressToBase64, orjson.dumps(sandbox_def).decode()
+            )
+            sandbox_url = f"https://codesandbox.io/api/v1/sandboxes/define?json=1&parameters={compressed}"
+            response = await client.get(sandbox_url)
+
+        if response.status_code not in [200, 201]:
+            logger.error(f"CodeSandbox error: {response.text}")
+            raise Exception(f"CodeSandbox API failed: {response.status_code}")
+
+        data = response.json()
+        sandbox_id = data.get("sandbox_id")
+
+        return {
+            "success": True,
+            "sandbox_id": sandbox_id,
+            "editor_url": f"https://codesandbox.io/s/{sandbox_id}",
+            "preview_url": f"https://{sandbox_id}.csb.app",
+            "embed_url": f"https://codesandbox.io/embed/{sandbox_id}"
+        }
+
+    def create_next_project_shell(self, title: str = "Landing Page") -> Dict[str, str]:
+        """Create the static Next.js scaffold (everything except the
+        generated component), so it can be prepared while the LLM call
+        is still in flight."""
+        return {**_STATIC_FILES, "package.json": _pkg_json(title)}
+
+    def create_next_project(self, component_code: str, title: str = "Landing Page") -> Dict[str, str]:
+        """Create a complete Next.js project structure."""
+        files = self.create_next_project_shell(title)
+        files["components/LandingPage.jsx"] = component_code
         return files
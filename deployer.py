@@ -3,8 +3,11 @@ Cloudflare Pages deployer - Create project via API, deploy via Wrangler CLI.
 """
 
 import os
+import collections
 import logging
+import shutil
 import tempfile
+import unicodedata
 import subprocess
 import re
 import asyncio
@@ -14,6 +17,39 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+_PAGES_URL_RE = re.compile(r'https://[a-z0-9-]+\.[a-z0-9-]+\.pages\.dev')
+_DASH_RE = re.compile(r'-+')
+
+# Deletion table for slugging. The name has already been forced to
+# ASCII by then, so 128 entries cover every character it can contain
+_SLUG_TABLE = {
+    i: None for i in range(128)
+    if chr(i) not in 'abcdefghijklmnopqrstuvwxyz0123456789-'
+}
+
+# One keep-alive pool shared by project creation and site verification,
+# so polling the same host reuses a single TLS connection
+_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def aclose():
+    """Close the shared client (shutdown hook)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 class CloudflareDeployer:
     """Deploy to Cloudflare Pages: API for project creation, Wrangler for deploy."""
@@ -30,32 +66,25 @@ class CloudflareDeployer:
 
     async def create_project(self, project_name: str) -> bool:
         """Create project via API."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Check if exists
-            resp = await client.get(
-                f"{self.base_url}/accounts/{self.account_id}/pages/projects/{project_name}",
-                headers={"Authorization": f"Bearer {self.api_token}"}
-            )
-            if resp.status_code == 200:
-                logger.info(f"Project {project_name} exists")
-                return True
-
-            # Create
-            resp = await client.post(
-                f"{self.base_url}/accounts/{self.account_id}/pages/projects",
-                headers={
-                    "Authorization": f"Bearer {self.api_token}",
-                    "Content-Type": "application/json"
-                },
-                json={"name": project_name, "production_branch": "main"}
-            )
-            if resp.status_code in [200, 201]:
-                logger.info(f"Created project: {project_name}")
-                return True
-            data = resp.json()
-            if "already exists" in str(data).lower():
-                return True
-            raise Exception(f"Failed to create project: {data}")
+        client = get_http_client()
+        # Create directly — the API reports duplicates itself, so the
+        # old existence pre-check was a wasted round-trip
+        resp = await client.post(
+            f"{self.base_url}/accounts/{self.account_id}/pages/projects",
+            headers={
+                "Authorization": f"Bearer {self.api_token}",
+                "Content-Type": "application/json"
+            },
+            json={"name": project_name, "production_branch": "main"}
+        )
+        if resp.status_code in [200, 201]:
+            logger.info(f"Created project: {project_name}")
+            return True
+        data = resp.json()
+        if "already exists" in str(data).lower():
+            logger.info(f"Project {project_name} exists")
+            return True
+        raise Exception(f"Failed to create project: {data}")
 
     async def deploy(self, project_name: str, html_content: str) -> Dict:
         """Deploy HTML to Cloudflare Pages."""
@@ -65,12 +94,16 @@ class CloudflareDeployer:
         # Step 1: Create project via API
         await self.create_project(project_name)
 
-        # Step 2: Deploy via Wrangler
-        with tempfile.TemporaryDirectory() as temp_dir:
-            html_path = os.path.join(temp_dir, "index.html")
-            with open(html_path, "w", encoding="utf-8") as f:
+        # Step 2: Deploy via Wrangler. The tempdir setup and HTML write
+        # are blocking file I/O, so keep them off the event loop
+        def write_site() -> str:
+            temp_dir = tempfile.mkdtemp()
+            with open(os.path.join(temp_dir, "index.html"), "w", encoding="utf-8") as f:
                 f.write(html_content)
+            return temp_dir
 
+        temp_dir = await asyncio.to_thread(write_site)
+        try:
             wrangler = os.path.join(self.project_dir, "node_modules", ".bin", "wrangler")
             cmd = [
                 wrangler, "pages", "deploy", temp_dir,
@@ -88,21 +121,40 @@ class CloudflareDeployer:
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
                 env=env
             )
 
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
-            out = stdout.decode() + stderr.decode()
+            # Stream output line by line instead of buffering the whole
+            # thing: only the last 500 lines are kept for diagnostics,
+            # and the URL regex runs per line until it first matches
+            tail = collections.deque(maxlen=500)
+            deploy_url = None
+
+            async def read_output():
+                nonlocal deploy_url
+                while True:
+                    line = await proc.stdout.readline()
+                    if not line:
+                        break
+                    text = line.decode(errors="replace")
+                    tail.append(text)
+                    if deploy_url is None:
+                        m = _PAGES_URL_RE.search(text)
+                        if m:
+                            deploy_url = m.group(0)
+
+            await asyncio.wait_for(
+                asyncio.gather(read_output(), proc.wait()), timeout=120
+            )
 
-            logger.info(f"Wrangler output: {out}")
+            logger.debug("Wrangler output: %s", "".join(tail))
 
             if proc.returncode != 0:
-                raise Exception(f"Deploy failed: {out[:500]}")
+                raise Exception(f"Deploy failed: {''.join(tail)[-500:]}")
 
-            # Extract URL
-            urls = re.findall(r'https://[a-z0-9-]+\.[a-z0-9-]+\.pages\.dev', out)
-            deploy_url = urls[0] if urls else f"https://{project_name}.pages.dev"
+            if deploy_url is None:
+                deploy_url = f"https://{project_name}.pages.dev"
             project_url = f"https://{project_name}.pages.dev"
 
             return {
@@ -111,15 +163,15 @@ class CloudflareDeployer:
                 "project_url": project_url,
                 "project_name": project_name
             }
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
 
     def generate_project_name(self, business_name: str) -> str:
-        import unicodedata
         name = unicodedata.normalize('NFKD', business_name)
         name = name.encode('ASCII', 'ignore').decode('ASCII').lower()
         name = name.replace(" ", "-").replace("_", "-")
-        name = "".join(c for c in name if c in 'abcdefghijklmnopqrstuvwxyz0123456789-')
-        while "--" in name:
-            name = name.replace("--", "-")
+        name = name.translate(_SLUG_TABLE)
+        name = _DASH_RE.sub('-', name)
         name = name.strip("-")[:35] or "landing"
         ts = datetime.now().strftime("%m%d%H%M")
         return f"{name}-{ts}"
@@ -129,19 +181,25 @@ class SiteVerifier:
     async def verify_site(self, url: str) -> Dict:
         results = {"url": url, "loads": False, "has_content": False, "errors": []}
         try:
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as c:
-                r = await c.get(url)
-                results["loads"] = r.status_code == 200
+            client = get_http_client()
+            # HEAD first: while the deployment is still propagating we
+            # learn the status without downloading the page body
+            head = await client.head(url, timeout=20.0)
+            results["loads"] = head.status_code == 200
+            if results["loads"]:
+                r = await client.get(url, timeout=20.0)
                 results["has_content"] = len(r.text) > 100
         except Exception as e:
             results["errors"].append(str(e))
         return results
 
-    async def wait_for_deployment(self, url: str, max_attempts: int = 8, delay: int = 3) -> Dict:
+    async def wait_for_deployment(self, url: str, max_attempts: int = 8, delay: float = 3) -> Dict:
         for i in range(max_attempts):
             logger.info(f"Verify attempt {i+1}/{max_attempts}")
             r = await self.verify_site(url)
             if r["loads"] and r["has_content"]:
                 return r
-            await asyncio.sleep(delay)
+            # Exponential backoff: fresh deployments usually land fast,
+            # stragglers get polled less aggressively
+            await asyncio.sleep(min(delay * (1.5 ** i), 10))
         return r
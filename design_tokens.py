@@ -2,6 +2,8 @@
 Professional Design Token System - Matching v0/Figma Make quality.
 """
 
+import json
+
 # Modern, professional color palettes
 COLOR_PALETTES = {
     "modern": {
@@ -190,10 +192,8 @@ COMPONENT_PATTERNS = """
 }
 """
 
-def get_tailwind_config(palette_name: str = "modern") -> str:
-    """Generate Tailwind config with design tokens."""
-    import json
-    palette = COLOR_PALETTES.get(palette_name, COLOR_PALETTES["modern"])
+def _build_tailwind_config(palette_name: str) -> str:
+    palette = COLOR_PALETTES[palette_name]
 
     primary_json = json.dumps(palette['primary'])
     neutral_json = json.dumps(palette['neutral'])
@@ -222,9 +222,25 @@ def get_tailwind_config(palette_name: str = "modern") -> str:
     """
 
 
-def get_design_system_prompt_addition() -> str:
-    """Get additional prompt content for better designs."""
-    return """
+# All four configs rendered once at import; the hot path is a dict get
+_TAILWIND_CONFIGS = {name: _build_tailwind_config(name) for name in COLOR_PALETTES}
+
+
+def get_tailwind_config(palette_name: str = "modern") -> str:
+    """Tailwind config with design tokens for a palette."""
+    return _TAILWIND_CONFIGS.get(palette_name, _TAILWIND_CONFIGS["modern"])
+
+
+def get_palette_module(palette_name: str = "modern") -> str:
+    """Pre-rendered prompt block for one palette: Tailwind config plus
+    the design principles. Byte-stable per palette, so generation
+    prompts that embed it keep a provider-cacheable prefix."""
+    return _PALETTE_MODULES.get(palette_name, _PALETTE_MODULES["modern"])
+
+
+# Frozen so every prompt that embeds it is byte-identical — the whole
+# point of placing it in a cacheable prefix
+DESIGN_SYSTEM_TEXT = """
 ## DESIGN PRINCIPLES (CRITICAL - FOLLOW EXACTLY)
 
 ### Visual Hierarchy
@@ -294,3 +310,20 @@ Secondary: "inline-flex items-center justify-center gap-2 rounded-xl border-2 bo
 - Social icons
 - Copyright + legal links
 """
+
+
+def get_design_system_prompt_addition() -> str:
+    """Get additional prompt content for better designs."""
+    return DESIGN_SYSTEM_TEXT
+
+
+# Rendered once at import — there are only four palettes, and keeping the
+# blocks identical across calls is what makes them cacheable
+_PALETTE_MODULES = {
+    name: (
+        f"## DESIGN TOKENS ({name} palette)\n"
+        + get_tailwind_config(name)
+        + get_design_system_prompt_addition()
+    )
+    for name in COLOR_PALETTES
+}
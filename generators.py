@@ -2,161 +2,337 @@
 Document generators for PLAN.md, DESIGN_SYSTEM.md, and BUILD_PROMPT.txt
 """
 
+import asyncio
 import logging
+import re
+from functools import cached_property
 from typing import Dict, Tuple
-from ai_client import AIClient
+from ai_client import get_client
 from research import WebResearcher
 from prompts import (
-    EXTRACT_BUSINESS_INFO_PROMPT,
-    GENERATE_PLAN_PROMPT,
-    GENERATE_DESIGN_SYSTEM_PROMPT,
-    GENERATE_BUILD_PROMPT_PROMPT
+    EXTRACT_BUSINESS_INFO_TEMPLATE,
+    GENERATE_PLAN_TEMPLATE,
+    GENERATE_DESIGN_SYSTEM_TEMPLATE,
+    GENERATE_BUILD_PROMPT_TEMPLATE
 )
 
 logger = logging.getLogger(__name__)
 
+# First URL in a raw brief, for the speculative scrape that runs while
+# the extraction LLM call is still in flight
+_URL_RE = re.compile(r'https?://\S+')
+
+# One FIELD_NAME: value line of the extraction response; a single
+# multiline pass replaces the per-line split-and-strip loop
+_FIELD_RE = re.compile(r'^([A-Z_]+):\s*(.+?)\s*$', re.MULTILINE)
+
+
+class _StreamBuffer:
+    """Accumulates one document's streamed text; ``ready`` fires once
+    the buffer holds enough to be worth speculating on (or the stream
+    ends first)."""
+
+    def __init__(self, threshold: int = 4000):
+        self._parts = []
+        self._size = 0
+        self._threshold = threshold
+        self.ready = asyncio.Event()
+
+    def write(self, chunk: str):
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        if self._size >= self._threshold and not self.ready.is_set():
+            self.ready.set()
+
+    def finish(self):
+        self.ready.set()
+
+    def partial(self) -> str:
+        return "".join(self._parts)
+
+
+def format_business_info(business_info: Dict) -> str:
+    """Format the extracted business info once, skipping empty fields so
+    they never pad a prompt."""
+    return "\n".join(
+        f"**{k.replace('_', ' ').title()}**: {v}"
+        for k, v in business_info.items() if v
+    )
+
 
 class LandingPageGenerator:
     """Generates landing page documents from business briefs."""
 
     def __init__(self):
-        self.ai = AIClient()
-        self.researcher = WebResearcher()
+        self.ai = get_client()
+
+    @cached_property
+    def researcher(self) -> WebResearcher:
+        # Built on first use: the researcher opens an HTTP/2 client and
+        # a DDGS session, which a generator that never researches
+        # (e.g. constructed for a /help reply) shouldn't pay for
+        return WebResearcher()
 
     async def extract_business_info(self, user_input: str) -> Dict:
         """Extract structured business info from free-form input."""
-        prompt = EXTRACT_BUSINESS_INFO_PROMPT.format(user_input=user_input)
+        prompt = EXTRACT_BUSINESS_INFO_TEMPLATE.substitute(user_input=user_input)
         response = await self.ai.generate(prompt, max_tokens=1000, temperature=0.3)
 
-        # Parse the structured response
+        # Parse the structured FIELD_NAME: value lines in one regex pass
         info = {}
-        for line in response.strip().split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip().lower().replace(' ', '_')
-                value = value.strip()
-                if value and value.upper() != "NOT PROVIDED":
-                    info[key] = value
+        for m in _FIELD_RE.finditer(response):
+            value = m.group(2)
+            if value.upper() != "NOT PROVIDED":
+                info[m.group(1).lower()] = value
 
         return info
 
-    async def perform_research(self, business_info: Dict) -> Dict:
-        """Perform web research on the business."""
+    async def perform_research(self, business_info: Dict,
+                               prelim_task=None, prelim_url: str = "") -> Dict:
+        """Perform web research on the business.
+
+        When a speculative scrape of the raw-input URL (prelim_task) is
+        in flight and the extracted website matches, its result is
+        merged in instead of scraping the site a second time.
+        """
         logger.info("Starting web research...")
 
-        research = self.researcher.research_business({
+        website = business_info.get("website", "")
+        reuse_prelim = (
+            prelim_task is not None
+            and website.rstrip('/') == prelim_url.rstrip('/')
+        )
+
+        research = await self.researcher.research_business({
             "name": business_info.get("business_name", ""),
-            "website": business_info.get("website", ""),
+            "website": "" if reuse_prelim else website,
             "industry": business_info.get("industry", ""),
             "location": business_info.get("location", "")
         })
 
+        if reuse_prelim:
+            prelim = await prelim_task
+            research["website_content"] = prelim.get("website_content")
+            research["sources"] = prelim.get("sources", []) + research["sources"]
+        elif prelim_task is not None:
+            prelim_task.cancel()
+
         logger.info(f"Research complete. Sources found: {len(research.get('sources', []))}")
         return research
 
-    async def generate_plan(self, business_info: Dict, research: Dict) -> str:
-        """Generate PLAN.md document."""
+    async def _generate_streaming(self, prompt: str, max_tokens: int,
+                                  temperature: float, label: str,
+                                  progress_callback=None, buffer=None) -> str:
+        """Stream one document, reporting progress every ~2KB so the
+        user sees movement during the long LLM calls. A ``buffer``
+        (``_StreamBuffer``) additionally receives every chunk, exposing
+        the partial text to concurrent speculation."""
+        parts = []
+        total = 0
+        next_tick = 2000
+        try:
+            async for chunk in self.ai.generate_stream(
+                prompt, max_tokens=max_tokens, temperature=temperature
+            ):
+                parts.append(chunk)
+                if buffer is not None:
+                    buffer.write(chunk)
+                total += len(chunk)
+                if progress_callback and total >= next_tick:
+                    next_tick = total + 2000
+                    await progress_callback(f"{label}... {total} chars")
+        finally:
+            if buffer is not None:
+                buffer.finish()
+        return "".join(parts)
+
+    async def generate_plan(self, business_info: Dict, research: Dict,
+                            progress_callback=None, business_text: str = None,
+                            buffer=None) -> str:
+        """Generate PLAN.md document.
+
+        ``business_text`` lets generate_all() pass the formatted info it
+        already built instead of formatting the dict again here.
+        """
         logger.info("Generating PLAN.md...")
 
-        # Format business info as text
-        business_text = "\n".join([
-            f"**{k.replace('_', ' ').title()}**: {v}"
-            for k, v in business_info.items()
-        ])
+        if business_text is None:
+            business_text = format_business_info(business_info)
 
         # Format research for prompt
         research_text = self.researcher.format_research_for_prompt(research)
 
-        prompt = GENERATE_PLAN_PROMPT.format(
+        prompt = GENERATE_PLAN_TEMPLATE.substitute(
             business_info=business_text,
             research=research_text
         )
 
         # Generate plan
-        plan = await self.ai.generate(prompt, max_tokens=8000, temperature=0.7)
+        plan = await self._generate_streaming(
+            prompt, 8000, 0.7, "📝 Writing PLAN.md", progress_callback, buffer)
 
         logger.info("PLAN.md generated")
         return plan
 
-    async def generate_design_system(self, business_info: Dict) -> str:
+    async def generate_design_system(self, business_info: Dict,
+                                     progress_callback=None, business_text: str = None,
+                                     buffer=None) -> str:
         """Generate DESIGN_SYSTEM.md document."""
         logger.info("Generating DESIGN_SYSTEM.md...")
 
-        # Format business info
-        business_text = "\n".join([
-            f"**{k.replace('_', ' ').title()}**: {v}"
-            for k, v in business_info.items()
-        ])
+        if business_text is None:
+            business_text = format_business_info(business_info)
 
-        prompt = GENERATE_DESIGN_SYSTEM_PROMPT.format(
+        prompt = GENERATE_DESIGN_SYSTEM_TEMPLATE.substitute(
             business_info=business_text,
             tone=business_info.get("brand_tone", "professional"),
             industry=business_info.get("industry", "general"),
             target=business_info.get("target_customer", "general audience")
         )
 
-        design_system = await self.ai.generate(prompt, max_tokens=4000, temperature=0.6)
+        design_system = await self._generate_streaming(
+            prompt, 4000, 0.6, "🎨 Creating DESIGN_SYSTEM.md", progress_callback, buffer)
 
         logger.info("DESIGN_SYSTEM.md generated")
         return design_system
 
-    async def generate_build_prompt(self, plan: str, design_system: str) -> str:
+    async def generate_build_prompt(self, plan: str, design_system: str,
+                                    progress_callback=None) -> str:
         """Generate BUILD_PROMPT.txt document."""
         logger.info("Generating BUILD_PROMPT.txt...")
 
-        prompt = GENERATE_BUILD_PROMPT_PROMPT.format(
+        prompt = GENERATE_BUILD_PROMPT_TEMPLATE.substitute(
             plan=plan,
             design_system=design_system
         )
 
-        build_prompt = await self.ai.generate(prompt, max_tokens=6000, temperature=0.5)
+        build_prompt = await self._generate_streaming(
+            prompt, 6000, 0.5, "🛠️ Writing BUILD_PROMPT.txt", progress_callback)
 
         logger.info("BUILD_PROMPT.txt generated")
         return build_prompt
 
-    async def generate_all(self, user_input: str, progress_callback=None) -> Tuple[str, str, str, Dict]:
+    async def stream_all(self, user_input: str, progress_callback=None):
         """
-        Generate all three documents from user input.
-
-        Args:
-            user_input: The user's business brief
-            progress_callback: Optional async function to call with progress updates
+        Generate the documents from user input, yielding each stage as
+        soon as it is ready.
 
-        Returns:
-            Tuple of (plan, design_system, build_prompt, business_info)
+        Yields ``(stage, content)`` pairs: ``business_info`` (dict),
+        ``plan``, ``design_system`` (in completion order) and
+        ``build_prompt``. A consumer can deliver PLAN.md the moment it
+        finishes instead of waiting for the whole pipeline.
         """
         async def update(msg):
             if progress_callback:
                 await progress_callback(msg)
 
-        # Step 1: Extract business info
+        # Step 1: Extract business info. If the raw brief already shows
+        # a URL, speculatively scrape it while the LLM call is in
+        # flight — on the common path the scrape is free
         await update("📋 Analyzing your business brief...")
+        m = _URL_RE.search(user_input)
+        prelim_url = m.group(0).rstrip('.,)') if m else ""
+        prelim_task = None
+        if prelim_url:
+            prelim_task = asyncio.create_task(
+                self.researcher.research_business({"website": prelim_url})
+            )
         business_info = await self.extract_business_info(user_input)
         await update(f"✅ Extracted info for: {business_info.get('business_name', 'your business')}")
+        yield "business_info", business_info
 
         # Step 2: Perform research
         await update("🔍 Researching your industry and competitors...")
-        research = await self.perform_research(business_info)
+        research = await self.perform_research(business_info, prelim_task, prelim_url)
         source_count = len(research.get('sources', []))
         await update(f"✅ Research complete ({source_count} sources found)")
 
-        # Step 3: Generate PLAN.md
-        await update("📝 Writing PLAN.md (landing page blueprint)...")
-        plan = await self.generate_plan(business_info, research)
-        await update("✅ PLAN.md complete")
-
-        # Step 4: Generate DESIGN_SYSTEM.md
-        await update("🎨 Creating DESIGN_SYSTEM.md (visual direction)...")
-        design_system = await self.generate_design_system(business_info)
-        await update("✅ DESIGN_SYSTEM.md complete")
-
-        # Step 5: Generate BUILD_PROMPT.txt
+        # Steps 3+4: PLAN.md needs the research, DESIGN_SYSTEM.md only
+        # needs the business info — run the two LLM calls concurrently
+        # and hand each over the moment its task finishes
+        await update("📝 Writing PLAN.md and DESIGN_SYSTEM.md...")
+        business_text = format_business_info(business_info)
+        plan_buf = _StreamBuffer()
+        design_buf = _StreamBuffer()
+        pending = {
+            asyncio.create_task(
+                self.generate_plan(business_info, research, update,
+                                   business_text, plan_buf)
+            ): "plan",
+            asyncio.create_task(
+                self.generate_design_system(business_info, update,
+                                            business_text, design_buf)
+            ): "design_system",
+        }
+
+        async def draft_build_prompt():
+            # Once both documents have streamed enough to speculate on,
+            # start BUILD_PROMPT from the partial text while their
+            # tails are still arriving
+            await plan_buf.ready.wait()
+            await design_buf.ready.wait()
+            plan_part = plan_buf.partial()
+            design_part = design_buf.partial()
+            logger.info(
+                "Speculative BUILD_PROMPT draft from partials (%d + %d chars)",
+                len(plan_part), len(design_part))
+            draft = await self.generate_build_prompt(plan_part, design_part)
+            return draft, len(plan_part), len(design_part)
+
+        draft_task = asyncio.create_task(draft_build_prompt())
+
+        docs = {}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = pending.pop(task)
+                    docs[stage] = task.result()
+                    yield stage, docs[stage]
+        except BaseException:
+            draft_task.cancel()
+            for task in pending:
+                task.cancel()
+            raise
+        await update("✅ PLAN.md and DESIGN_SYSTEM.md complete")
+
+        # Step 5: BUILD_PROMPT.txt. Use the speculative draft when its
+        # inputs covered at least half of each final document —
+        # otherwise the draft missed too much and we regenerate from
+        # the full text
         await update("🛠️ Writing BUILD_PROMPT.txt (vibecoding prompt)...")
-        build_prompt = await self.generate_build_prompt(plan, design_system)
+        build_prompt = None
+        try:
+            draft, plan_seen, design_seen = await draft_task
+            if (plan_seen * 2 >= len(docs["plan"])
+                    and design_seen * 2 >= len(docs["design_system"])):
+                logger.info("Using speculative BUILD_PROMPT draft")
+                build_prompt = draft
+        except Exception as e:
+            logger.warning(f"Speculative BUILD_PROMPT draft failed: {e}")
+        if build_prompt is None:
+            build_prompt = await self.generate_build_prompt(
+                docs["plan"], docs["design_system"], update)
         await update("✅ BUILD_PROMPT.txt complete")
+        yield "build_prompt", build_prompt
 
-        return plan, design_system, build_prompt, business_info
+    async def generate_all(self, user_input: str, progress_callback=None) -> Tuple[str, str, str, Dict]:
+        """
+        Generate all three documents from user input.
+
+        Thin wrapper over stream_all() for callers that want everything
+        at once.
+
+        Returns:
+            Tuple of (plan, design_system, build_prompt, business_info)
+        """
+        results = {}
+        async for stage, content in self.stream_all(user_input, progress_callback):
+            results[stage] = content
+        return (results["plan"], results["design_system"],
+                results["build_prompt"], results["business_info"])
 
     def close(self):
         """Clean up resources."""
-        self.researcher.close()
+        if 'researcher' in self.__dict__:
+            self.researcher.close()
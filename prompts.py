@@ -1,11 +1,17 @@
 """
 AI prompts for the Landing Page Maker agent.
+
+Each prompt is a string.Template compiled once at import: substitute()
+walks the pre-parsed template instead of re-scanning the multi-KB
+string for placeholders the way str.format does per call.
 """
 
-EXTRACT_BUSINESS_INFO_PROMPT = """Analyze the following user input and extract structured business information.
+from string import Template
+
+EXTRACT_BUSINESS_INFO_TEMPLATE = Template("""Analyze the following user input and extract structured business information.
 
 USER INPUT:
-{user_input}
+${user_input}
 
 Extract and return ONLY a structured response in this exact format (use "NOT PROVIDED" if information is missing):
 
@@ -22,16 +28,16 @@ FONTS: [any mentioned fonts or NOT PROVIDED]
 EXAMPLE_SITES: [any sites they like or NOT PROVIDED]
 ADDITIONAL_CONTEXT: [any other relevant details]
 
-Be precise. Extract only what is explicitly stated or can be directly inferred."""
+Be precise. Extract only what is explicitly stated or can be directly inferred.""")
 
 
-GENERATE_PLAN_PROMPT = """You are a conversion-focused landing page strategist. Your job is to create PLAN.md - a complete, execution-ready landing page blueprint.
+GENERATE_PLAN_TEMPLATE = Template("""You are a conversion-focused landing page strategist. Your job is to create PLAN.md - a complete, execution-ready landing page blueprint.
 
 ## BUSINESS BRIEF
-{business_info}
+${business_info}
 
 ## RESEARCH FINDINGS
-{research}
+${research}
 
 ## YOUR TASK
 Write PLAN.md following this structure. Write in natural, confident prose - not dry checklists. Every section must include ACTUAL DRAFT COPY that sounds like a real brand.
@@ -123,18 +129,18 @@ IMPORTANT RULES:
 3. Write copy that sounds like a real brand, not generic marketing speak
 4. Be specific to this industry and this business
 5. Every headline and CTA must be written out - no placeholders like "[Compelling headline here]"
-"""
+""")
 
 
-GENERATE_DESIGN_SYSTEM_PROMPT = """You are a design systems expert. Create DESIGN_SYSTEM.md for a landing page.
+GENERATE_DESIGN_SYSTEM_TEMPLATE = Template("""You are a design systems expert. Create DESIGN_SYSTEM.md for a landing page.
 
 ## BUSINESS CONTEXT
-{business_info}
+${business_info}
 
 ## BRAND DIRECTION
-Tone: {tone}
-Industry: {industry}
-Target Customer: {target}
+Tone: ${tone}
+Industry: ${industry}
+Target Customer: ${target}
 
 ## YOUR TASK
 Write DESIGN_SYSTEM.md that defines the visual direction and selects ONE component library.
@@ -215,16 +221,16 @@ RULES:
 3. The install command must be a single line that works with npm
 4. If the library requires Tailwind or other peer deps, include them in the install
 5. Do NOT include code examples - just the single install command
-"""
+""")
 
 
-GENERATE_BUILD_PROMPT_PROMPT = """You are an expert at writing prompts for AI code generation tools (like Figma Make, v0.dev, Bolt, Cursor).
+GENERATE_BUILD_PROMPT_TEMPLATE = Template("""You are an expert at writing prompts for AI code generation tools (like Figma Make, v0.dev, Bolt, Cursor).
 
 ## THE PLAN
-{plan}
+${plan}
 
 ## THE DESIGN SYSTEM
-{design_system}
+${design_system}
 
 ## YOUR TASK
 Write BUILD_PROMPT.txt - a single, copy-paste-ready prompt that someone can use in a vibecoding platform to build this exact landing page.
@@ -254,4 +260,4 @@ Format it as plain text that someone can directly paste into Figma Make, v0.dev,
 ---
 
 Write the complete BUILD_PROMPT.txt content now:
-"""
+""")
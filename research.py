@@ -2,7 +2,11 @@
 Web research module: search and scrape functionality.
 """
 
+import asyncio
+import io
 import logging
+import random
+import time
 import httpx
 from typing import Optional, List, Dict
 from urllib.parse import urlparse
@@ -10,6 +14,52 @@ from duckduckgo_search import DDGS
 
 logger = logging.getLogger(__name__)
 
+# Pages are truncated downstream anyway; parsing more than this many
+# bytes is pure waste
+MAX_PAGE_BYTES = 512 * 1024
+
+# At most this many DuckDuckGo queries in flight across the process;
+# a parallel burst is the quickest way to earn a 429 ban
+_DDG_SEM = asyncio.Semaphore(3)
+
+# Transient-failure retry policy for searches and page fetches
+_MAX_ATTEMPTS = 3
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, capped at 10s."""
+    return min(2.0 ** attempt, 10.0) * (0.5 + random.random() / 2)
+
+
+# Prompt budget for scraped website content, in (approximate) tokens
+CONTENT_TOKEN_BUDGET = 1500
+
+# Per-field caps in the research prompt; pathological search results
+# can carry arbitrarily long titles and snippets
+MAX_TITLE_CHARS = 200
+MAX_SNIPPET_CHARS = 500
+
+# Rough chars-per-token ratio for English prose on current tokenizers
+_CHARS_PER_TOKEN = 4
+
+
+def _truncate_to_tokens(text: str, budget: int = CONTENT_TOKEN_BUDGET) -> str:
+    """Cut ``text`` to roughly ``budget`` tokens of prompt space.
+
+    Uses the ~4 chars/token heuristic rather than a real tokenizer, and
+    backs up to the nearest paragraph or word boundary so the slice
+    never ends mid-word (or mid-codepoint on exotic text).
+    """
+    limit = budget * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind('\n', 0, limit)
+    if cut < limit // 2:
+        cut = text.rfind(' ', 0, limit)
+    if cut < limit // 2:
+        cut = limit
+    return text[:cut]
+
 # Try to import trafilatura for better web scraping
 try:
     import trafilatura
@@ -18,6 +68,14 @@ except ImportError:
     HAS_TRAFILATURA = False
     logger.warning("trafilatura not available, using basic scraping")
 
+# Prefer selectolax (C-backed HTML5 parser) over BeautifulSoup's pure
+# Python html.parser for the fallback parse
+try:
+    from selectolax.parser import HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
 try:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
@@ -29,13 +87,25 @@ class WebResearcher:
     """Handles web research: searching and scraping."""
 
     def __init__(self):
+        # HTTP/2 multiplexes concurrent scrapes over one connection per
+        # host, and keepalive skips the TLS handshake on repeat fetches
         self.client = httpx.Client(
             timeout=30.0,
             follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=16,
+                max_keepalive_connections=8,
+                keepalive_expiry=30.0
+            ),
             headers={
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+                "Accept-Encoding": "gzip, br"
             }
         )
+        # One DDGS session for the researcher's lifetime: constructing
+        # it per search paid client init + TLS setup on every query
+        self._ddgs = DDGS()
 
     def search(self, query: str, max_results: int = 10) -> List[Dict]:
         """
@@ -43,14 +113,65 @@ class WebResearcher:
 
         Returns list of {title, body, href}
         """
-        try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
-            logger.info(f"Search '{query}' returned {len(results)} results")
-            return results
-        except Exception as e:
-            logger.error(f"Search failed: {e}")
-            return []
+        last_error = None
+        for attempt in range(_MAX_ATTEMPTS):
+            if attempt:
+                logger.warning(
+                    f"Retrying search ({attempt + 1}/{_MAX_ATTEMPTS}): '{query}'")
+                time.sleep(_retry_delay(attempt - 1))
+            try:
+                results = list(self._ddgs.text(query, max_results=max_results))
+                logger.info(f"Search '{query}' returned {len(results)} results")
+                return results
+            except Exception as e:
+                last_error = e
+        logger.error(f"Search failed after {_MAX_ATTEMPTS} attempts: {last_error}")
+        return []
+
+    async def search_many(self, queries: List[tuple]) -> List[List[Dict]]:
+        """Run several ``(query, max_results)`` searches concurrently.
+
+        Each query still costs DuckDuckGo a round-trip, but they run in
+        parallel worker threads over the shared session, so the batch
+        takes as long as the slowest query instead of the sum, while
+        the module-wide semaphore keeps the burst polite."""
+        async def bounded(query, max_results):
+            async with _DDG_SEM:
+                return await asyncio.to_thread(self.search, query, max_results)
+
+        return await asyncio.gather(*(bounded(q, n) for q, n in queries))
+
+    def _fetch_html(self, url: str) -> str:
+        """GET ``url``, retrying transient failures, and stream the body
+        so it stops at MAX_PAGE_BYTES — a huge page can't balloon parse
+        time and memory."""
+        last_error = None
+        for attempt in range(_MAX_ATTEMPTS):
+            if attempt:
+                logger.warning(
+                    f"Retrying fetch ({attempt + 1}/{_MAX_ATTEMPTS}): {url}")
+                time.sleep(_retry_delay(attempt - 1))
+            try:
+                with self.client.stream('GET', url) as response:
+                    response.raise_for_status()
+                    chunks = []
+                    total = 0
+                    for chunk in response.iter_bytes(chunk_size=65536):
+                        chunks.append(chunk)
+                        total += len(chunk)
+                        if total >= MAX_PAGE_BYTES:
+                            logger.info(f"Truncating oversized page: {url}")
+                            break
+                    return b''.join(chunks).decode(
+                        response.encoding or 'utf-8', errors='replace')
+            except httpx.HTTPStatusError as e:
+                code = e.response.status_code
+                if 400 <= code < 500 and code != 429:
+                    raise  # a plain client error won't clear on retry
+                last_error = e
+            except httpx.HTTPError as e:
+                last_error = e
+        raise last_error
 
     def scrape_website(self, url: str) -> Dict:
         """
@@ -77,9 +198,7 @@ class WebResearcher:
         }
 
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            html = response.text
+            html = self._fetch_html(url)
 
             # Try trafilatura first (best for article extraction)
             if HAS_TRAFILATURA:
@@ -92,7 +211,33 @@ class WebResearcher:
                 if content:
                     result["content"] = content
 
-            # Fallback to BeautifulSoup
+            # Fallback to selectolax: same extraction as the BS4 path
+            # but parsed in C instead of Python bytecode
+            if not result["content"] and HAS_SELECTOLAX:
+                tree = HTMLParser(html)
+
+                title = tree.css_first('title')
+                if title:
+                    result["title"] = title.text(strip=True)
+
+                meta_desc = tree.css_first('meta[name="description"]')
+                if meta_desc:
+                    result["meta_description"] = meta_desc.attributes.get('content', '') or ''
+
+                for node in tree.css('script, style, nav, footer, header, aside'):
+                    node.decompose()
+
+                main = tree.css_first('main') or tree.css_first('article') or tree.body
+                if main:
+                    result["content"] = main.text(separator='\n', strip=True)
+
+                for link in tree.css('a[href]')[:20]:
+                    href = link.attributes.get('href', '') or ''
+                    text = link.text(strip=True)
+                    if text and href and not href.startswith('#'):
+                        result["links"].append({"text": text, "href": href})
+
+            # Last resort: BeautifulSoup
             if not result["content"] and HAS_BS4:
                 soup = BeautifulSoup(html, 'html.parser')
 
@@ -131,7 +276,20 @@ class WebResearcher:
 
         return result
 
-    def research_business(self, business_info: Dict) -> Dict:
+    async def scrape_many(self, urls: List[str], concurrency: int = 8) -> List[Dict]:
+        """Scrape several URLs concurrently, bounded by a semaphore so a
+        burst of competitor pages can't monopolize the thread pool."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(url: str) -> Dict:
+            async with sem:
+                return await asyncio.to_thread(self.scrape_website, url)
+
+        return await asyncio.gather(
+            *(scrape_one(u) for u in urls), return_exceptions=True
+        )
+
+    async def research_business(self, business_info: Dict) -> Dict:
         """
         Perform comprehensive research on a business.
 
@@ -149,135 +307,172 @@ class WebResearcher:
             "sources": []
         }
 
-        # 1. Scrape the business website if provided
         website = business_info.get("website")
-        if website:
-            logger.info(f"Scraping business website: {website}")
-            research["website_content"] = self.scrape_website(website)
-            if research["website_content"]["success"]:
-                research["sources"].append({
-                    "type": "primary",
-                    "url": website,
-                    "description": "Official business website"
-                })
-
-        # 2. Search for competitors
         name = business_info.get("name", "")
         industry = business_info.get("industry", "")
         location = business_info.get("location", "")
 
+        queries = {}
         if industry:
-            query = f"{industry} competitors {location}".strip()
-            logger.info(f"Searching competitors: {query}")
-            results = self.search(query, max_results=5)
-            for r in results:
-                research["competitor_info"].append({
-                    "title": r.get("title", ""),
-                    "snippet": r.get("body", ""),
-                    "url": r.get("href", "")
-                })
-                research["sources"].append({
-                    "type": "competitor",
-                    "url": r.get("href", ""),
-                    "description": r.get("title", "")
-                })
-
-        # 3. Search for industry best practices
-        if industry:
-            query = f"{industry} landing page best practices conversion"
-            logger.info(f"Searching best practices: {query}")
-            results = self.search(query, max_results=5)
-            for r in results:
-                research["industry_insights"].append({
-                    "title": r.get("title", ""),
-                    "snippet": r.get("body", ""),
-                    "url": r.get("href", "")
-                })
-
-        # 4. Search for trust signals in this industry
-        if industry:
-            query = f"{industry} customer concerns objections trust"
-            logger.info(f"Searching trust signals: {query}")
-            results = self.search(query, max_results=5)
-            for r in results:
-                research["trust_signals"].append({
-                    "title": r.get("title", ""),
-                    "snippet": r.get("body", ""),
-                    "url": r.get("href", "")
-                })
-
-        # 5. If business name provided, search for reviews/reputation
+            queries["competitors"] = (f"{industry} competitors {location}".strip(), 5)
+            queries["insights"] = (f"{industry} landing page best practices conversion", 5)
+            queries["trust"] = (f"{industry} customer concerns objections trust", 5)
         if name:
-            query = f'"{name}" reviews reputation'
-            logger.info(f"Searching reputation: {query}")
-            results = self.search(query, max_results=3)
-            for r in results:
+            queries["reputation"] = (f'"{name}" reviews reputation', 3)
+
+        # Dispatch the scrape and the search batch together: the network
+        # waits overlap, so wall time is the slowest call instead of the sum
+        tasks = {}
+        if website:
+            logger.info(f"Scraping business website: {website}")
+            tasks["website"] = asyncio.to_thread(self.scrape_website, website)
+        if queries:
+            tasks["searches"] = self.search_many(list(queries.values()))
+
+        if tasks:
+            done = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+        else:
+            done = {}
+        results = dict(zip(queries, done.get("searches", ())))
+        if "website" in done:
+            results["website"] = done["website"]
+
+        # The same URL often surfaces in several queries; keep only its
+        # first appearance so duplicates don't pad the prompt. Keys are
+        # host+path, which folds ?utm= variants of one page together
+        seen = set()
+
+        def first_sighting(url: str) -> bool:
+            parsed = urlparse(url)
+            key = parsed.netloc + parsed.path
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+        # 1. The business website, if provided
+        website_content = results.get("website")
+        if website_content is not None:
+            research["website_content"] = website_content
+            if website_content["success"]:
+                first_sighting(website)
                 research["sources"].append({
-                    "type": "reputation",
-                    "url": r.get("href", ""),
-                    "description": r.get("title", "")
+                    "type": "primary",
+                    "url": website,
+                    "description": "Official business website"
                 })
 
+        # 2. Competitors
+        for r in results.get("competitors", []):
+            if not first_sighting(r.get("href", "")):
+                continue
+            research["competitor_info"].append({
+                "title": r.get("title", ""),
+                "snippet": r.get("body", ""),
+                "url": r.get("href", "")
+            })
+            research["sources"].append({
+                "type": "competitor",
+                "url": r.get("href", ""),
+                "description": r.get("title", "")
+            })
+
+        # 3. Industry best practices
+        for r in results.get("insights", []):
+            if not first_sighting(r.get("href", "")):
+                continue
+            research["industry_insights"].append({
+                "title": r.get("title", ""),
+                "snippet": r.get("body", ""),
+                "url": r.get("href", "")
+            })
+
+        # 4. Trust signals in this industry
+        for r in results.get("trust", []):
+            if not first_sighting(r.get("href", "")):
+                continue
+            research["trust_signals"].append({
+                "title": r.get("title", ""),
+                "snippet": r.get("body", ""),
+                "url": r.get("href", "")
+            })
+
+        # 5. Reviews/reputation, if the business name is known
+        for r in results.get("reputation", []):
+            if not first_sighting(r.get("href", "")):
+                continue
+            research["sources"].append({
+                "type": "reputation",
+                "url": r.get("href", ""),
+                "description": r.get("title", "")
+            })
+
+        # 6. Pull short excerpts from the top competitor pages — the
+        # snippets alone are often too thin to position against
+        top = [c for c in research["competitor_info"][:3] if c["url"]]
+        if top:
+            pages = await self.scrape_many([c["url"] for c in top])
+            for comp, page in zip(top, pages):
+                if isinstance(page, dict) and page.get("success"):
+                    comp["page_excerpt"] = page["content"][:500]
+
         return research
 
     def format_research_for_prompt(self, research: Dict) -> str:
-        """Format research results into a string for AI prompt."""
-        sections = []
+        """Format research results into a string for AI prompt.
+
+        Written through one io.StringIO in a single pass — the old
+        per-section joins allocated a pile of intermediate strings —
+        with titles and snippets capped at fixed lengths.
+        """
+        buf = io.StringIO()
 
         # Website content
         if research.get("website_content") and research["website_content"].get("success"):
             wc = research["website_content"]
-            content = wc.get("content", "")[:5000]  # Limit size
-            sections.append(f"""## BUSINESS WEBSITE CONTENT
-URL: {wc.get('url', '')}
-Title: {wc.get('title', '')}
-Meta Description: {wc.get('meta_description', '')}
-
-Content:
-{content}
-""")
+            buf.write("## BUSINESS WEBSITE CONTENT\n")
+            buf.write(f"URL: {wc.get('url', '')}\n")
+            buf.write(f"Title: {wc.get('title', '')[:MAX_TITLE_CHARS]}\n")
+            buf.write(f"Meta Description: {wc.get('meta_description', '')[:MAX_SNIPPET_CHARS]}\n")
+            buf.write("\nContent:\n")
+            buf.write(_truncate_to_tokens(wc.get("content", "")))
+            buf.write("\n\n\n")
 
         # Competitor info
         if research.get("competitor_info"):
-            comp_text = "\n".join([
-                f"- **{c['title']}**: {c['snippet']}"
-                for c in research["competitor_info"][:5]
-            ])
-            sections.append(f"""## COMPETITOR LANDSCAPE
-{comp_text}
-""")
+            buf.write("## COMPETITOR LANDSCAPE\n")
+            for c in research["competitor_info"][:5]:
+                buf.write(f"- **{c['title'][:MAX_TITLE_CHARS]}**: "
+                          f"{c['snippet'][:MAX_SNIPPET_CHARS]}\n")
+                if c.get("page_excerpt"):
+                    buf.write(f"  Excerpt: {c['page_excerpt'][:MAX_SNIPPET_CHARS]}\n")
+            buf.write("\n\n")
 
         # Industry insights
         if research.get("industry_insights"):
-            insights_text = "\n".join([
-                f"- **{i['title']}**: {i['snippet']}"
-                for i in research["industry_insights"][:5]
-            ])
-            sections.append(f"""## INDUSTRY INSIGHTS
-{insights_text}
-""")
+            buf.write("## INDUSTRY INSIGHTS\n")
+            for i in research["industry_insights"][:5]:
+                buf.write(f"- **{i['title'][:MAX_TITLE_CHARS]}**: "
+                          f"{i['snippet'][:MAX_SNIPPET_CHARS]}\n")
+            buf.write("\n\n")
 
         # Trust signals
         if research.get("trust_signals"):
-            trust_text = "\n".join([
-                f"- **{t['title']}**: {t['snippet']}"
-                for t in research["trust_signals"][:5]
-            ])
-            sections.append(f"""## CUSTOMER CONCERNS & TRUST FACTORS
-{trust_text}
-""")
+            buf.write("## CUSTOMER CONCERNS & TRUST FACTORS\n")
+            for t in research["trust_signals"][:5]:
+                buf.write(f"- **{t['title'][:MAX_TITLE_CHARS]}**: "
+                          f"{t['snippet'][:MAX_SNIPPET_CHARS]}\n")
+            buf.write("\n\n")
 
         # Sources
         if research.get("sources"):
-            sources_text = "\n".join([
-                f"- [{s['type'].upper()}] {s['description']}: {s['url']}"
-                for s in research["sources"][:10]
-            ])
-            sections.append(f"""## SOURCES CONSULTED
-{sources_text}
-""")
-
-        return "\n\n".join(sections)
+            buf.write("## SOURCES CONSULTED\n")
+            for s in research["sources"][:10]:
+                buf.write(f"- [{s['type'].upper()}] "
+                          f"{s['description'][:MAX_TITLE_CHARS]}: {s['url']}\n")
+            buf.write("\n\n")
+
+        return buf.getvalue().rstrip("\n")
 
     def close(self):
         """Close the HTTP client."""